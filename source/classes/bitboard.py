@@ -0,0 +1,55 @@
+import numpy as np
+
+
+class Bitboard:
+    def __init__(self, board_size: int):
+        """
+        Geometry of a board whose sets of nodes are bitboards, i.e., Python integers where node (x, y) is
+        bit x * board_size + y, so that connectivity is computed with a few shifts and masks per step of a flood fill.
+        The BLACK player (1) connects the left and right columns, the WHITE player (2) the top and bottom rows.
+        """
+        self.board_size = n = board_size
+        self.full = (1 << n * n) - 1
+
+        first_column = sum(1 << x * n for x in range(n))
+        self.first_column = first_column
+        self.last_column = first_column << n - 1
+        self.first_row = (1 << n) - 1
+        self.last_row = self.first_row << n * (n - 1)
+
+        # Borders to connect for each player
+        self.borders = { 1: (self.first_column, self.last_column),
+                         2: (self.first_row, self.last_row) }
+
+    def dilate(self, bits: int) -> int:
+        """
+        @return   The given nodes and all their neighbours.
+        """
+        n = self.board_size
+        return (bits | bits << n | bits >> n
+                | (bits << 1 | bits >> n - 1) & ~self.first_column
+                | (bits >> 1 | bits << n - 1) & ~self.last_column) & self.full
+
+    def connects(self, stones: int, player: int) -> bool:
+        """
+        @return   True iff the stones of the player connect his two borders.
+        """
+        start, end = self.borders[player]
+        reached = stones & start
+        while reached:
+            if reached & end:
+                return True
+            extended = self.dilate(reached) & stones
+            if extended == reached:
+                return False
+            reached = extended
+        return False
+
+    def from_board(self, board: np.ndarray) -> tuple:
+        """
+        @return   The bitboards of the BLACK and WHITE stones of a board.
+        """
+        cells = np.asarray(board).ravel()
+        black = sum(1 << int(node) for node in np.flatnonzero(cells == 1))
+        white = sum(1 << int(node) for node in np.flatnonzero(cells == 2))
+        return (black, white)
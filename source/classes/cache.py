@@ -0,0 +1,111 @@
+import os
+from typing import Optional
+
+import numpy as np
+
+from classes.transposition import Entry, pack, unpack
+
+# Record of the cache file: the key of a position (see STRAT.cache_key) and its packed entry (see pack)
+RECORD = np.dtype([ ("key", "<u8"), ("data", "<u8") ])
+
+# Header of the cache file, before its records: a magic string and the version of the format.
+# The version must be bumped whenever stored entries change meaning, e.g., the scores of STRAT.terminal_score,
+# the keys of STRAT.table_key, or the packing of classes/transposition.py.
+MAGIC = b"HEXCACHE"
+VERSION = 1
+HEADER = np.dtype([ ("magic", "S8"), ("version", "<u8") ])
+
+
+class PositionCache:
+    def __init__(self, path: str, min_depth: int = 2):
+        """
+        Search results kept from one run to the next, in a file of records sorted by key after a versioned header,
+        which is memory-mapped read-only and queried with one binary search per position.
+        A file of another format or version raises a ValueError rather than being read.
+
+        Results of a run searched at least "min_depth" plies deep are kept in memory, and written to the file
+        by merge, at the end of the run.
+        """
+        self.path = path
+        self.min_depth = min_depth
+        self.new = {}
+        self.load()
+
+    def load(self) -> None:
+        self.records = np.zeros(0, dtype=RECORD)
+        if os.path.exists(self.path):
+            header = np.fromfile(self.path, dtype=HEADER, count=1)
+            if len(header) == 0 or header["magic"][0] != MAGIC:
+                raise ValueError(f"{self.path} is not a position cache")
+            if header["version"][0] != VERSION:
+                raise ValueError(f"{self.path} is a position cache of version {header['version'][0]}, "
+                                 f"not {VERSION}: remove it to start a new one")
+
+            n_records = (os.path.getsize(self.path) - HEADER.itemsize) // RECORD.itemsize
+            if n_records:
+                self.records = np.memmap(self.path, dtype=RECORD, mode="r", offset=HEADER.itemsize, shape=(n_records,))
+        self.keys = self.records["key"]
+
+    def __len__(self) -> int:
+        return len(self.keys) + len(self.new)
+
+    def probe(self, key: int) -> Optional[Entry]:
+        """
+        @return   The entry of the key, if any, either found during this run or read from the file.
+        """
+        data = self.new.get(key)
+        if data is None:
+            index = np.searchsorted(self.keys, np.uint64(key))
+            if index == len(self.keys) or self.keys[index] != key:
+                return None
+            data = int(self.records["data"][index])
+        return unpack(data)
+
+    def store(self, key: int, value: int, depth: int, bound: int, move: Optional[int] = None) -> None:
+        """
+        Keeps an entry for the end of the run, unless a deeper one is already known.
+        """
+        if depth < self.min_depth:
+            return
+        entry = self.probe(key)
+        if entry is None or depth >= entry.depth:
+            self.new[key] = pack(value, depth, bound, move)
+
+    def drain(self) -> dict:
+        """
+        @return   The packed entries found since the last call, by key, e.g., to be sent from a worker process
+                  to the cache of the tournament (see update).
+        """
+        new, self.new = self.new, {}
+        return new
+
+    def update(self, entries: dict) -> None:
+        for key, data in entries.items():
+            self.store(key, *unpack(data))
+
+    def merge(self) -> int:
+        """
+        Writes the records of the file and those found during the run to the file, atomically, and maps it again.
+        The file is only ever replaced as a whole, so that concurrent runs keep reading their own mapping.
+
+        @return   The number of records of the file.
+        """
+        if self.new:
+            records = np.zeros(len(self.new), dtype=RECORD)
+            records["key"] = np.fromiter(self.new.keys(), dtype=np.uint64, count=len(self.new))
+            records["data"] = np.fromiter(self.new.values(), dtype=np.uint64, count=len(self.new))
+
+            # New records come last, so that they replace the old ones with the same key (stored only when deeper)
+            records = np.concatenate([ self.records, records ])
+            records = records[np.argsort(records["key"], kind="stable")]
+            last = np.append(records["key"][1:] != records["key"][:-1], True)
+
+            header = np.array([ (MAGIC, VERSION) ], dtype=HEADER)
+            temporary = self.path + ".tmp"
+            with open(temporary, "wb") as file:
+                file.write(header.tobytes())
+                file.write(records[last].tobytes())
+            os.replace(temporary, self.path)
+            self.new = {}
+            self.load()
+        return len(self.keys)
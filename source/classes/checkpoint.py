@@ -0,0 +1,40 @@
+import json
+import os
+from typing import Optional
+
+# Names of the arguments of a tournament (see Tournament.__init__), and of its players, as stored in a checkpoint
+ARG_NAMES = ("board size", "mode", "game count", "number of games")
+PLAYER_NAMES = { "1": "black player", "2": "white player" }
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    """
+    Writes a checkpoint atomically, so that an interrupted write never loses the previous checkpoint.
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump(checkpoint, file)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str) -> Optional[dict]:
+    """
+    @return   The checkpoint written at the given path, or None if there is none.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def check_checkpoint(path: str, checkpoint: dict, args: list, strategies: dict) -> None:
+    """
+    Raises a ValueError naming the first field of the checkpoint that differs from the championship to resume,
+    i.e., from its arguments and the strategy of each player (see Tournament.strategies_key).
+    """
+    fields = [ (name, stored, expected) for name, stored, expected in zip(ARG_NAMES, checkpoint["args"], args) ]
+    fields += [ (PLAYER_NAMES[player], checkpoint["strategies"].get(player), strategy)
+                for player, strategy in strategies.items() ]
+    for name, stored, expected in fields:
+        if stored != expected:
+            raise ValueError(f"checkpoint {path} is for another championship: its {name} is {stored}, not {expected}")
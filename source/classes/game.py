@@ -1,23 +1,27 @@
 import sys
+from typing import Optional
 
-import pygame
 from rich.console import Console
 from rich.table import Table
 
 from classes.logic import Logic
-from classes.ui import UI
 
 
 class Game:
 
-    def __init__(self, board_size: int, mode: str, black_starts: bool = True):
+    def __init__(self, board_size: int, mode: str, black_starts: bool = True,
+                 strategies: Optional[dict] = None, headless: bool = False, priors=None):
         """
         Initialisation of a new game with:
             * the size of the board,
             * the playing mode, i.e., "ai_vs_ai", "man_vs_ai",
-            * which player starts, i.e., black (by default) or white.
+            * which player starts, i.e., black (by default) or white,
+            * the strategy played by each AI player, e.g., {1: "random", 2: "minimaxAB_bestChoice"},
+            * whether the game runs without any window (only in "ai_vs_ai" mode),
+            * an optional PatternScorer ranking the moves explored by the AI players.
 
         Besides, the user interface is initialised and displayed.
+        In headless mode, pygame is never imported.
 
         Also, public variables are set to their initial values:
             * there is no current node (set to None), which is an integer representing the 1D coordinates in a numpy array,
@@ -38,8 +42,13 @@ class Game:
         self.turn_state = black_starts
 
         # Instantiate classes
+        self.headless = headless and not self.modes["man_vs_ai"]
+        if self.headless:
+            from classes.headless import HeadlessUI as UI
+        else:
+            from classes.ui import UI
         self.ui = UI(board_size, mode)
-        self.logic = Logic(self.ui)
+        self.logic = Logic(self.ui, strategies, priors)
 
         # Initialize public variables
         self.node = None
@@ -75,6 +84,7 @@ class Game:
         Deals with one step of a game from either player taking into account the user interface and the fact that the human player can quit the game.
         """
         if self.modes["man_vs_ai"]:
+            import pygame
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
@@ -146,6 +156,11 @@ class Game:
         """
         Runs a full game.
         """
+        if self.headless:
+            self.handle_events()
+            return
+
+        import pygame
         self.ui.draw_board()
 
         if self.modes["man_vs_ai"]:
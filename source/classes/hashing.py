@@ -0,0 +1,54 @@
+import hashlib
+
+import numpy as np
+
+# Powers of three, enough for the boards of classes/solver.py, i.e., up to 4x4
+POWERS_OF_THREE = 3 ** np.arange(16, dtype=np.int64)
+
+
+def board_key(board: np.ndarray, player: int) -> int:
+    """
+    @return   A unique integer for the position, i.e., the board read as a base-3 number, and the player to move.
+    """
+    cells = np.asarray(board, dtype=np.int64).ravel()
+    assert len(cells) <= len(POWERS_OF_THREE), "board too large for an exact key"
+    return int(cells @ POWERS_OF_THREE[:len(cells)]) * 2 + player - 1
+
+
+# Zobrist keys of each (node, stone) of boards up to 26x26, and of each player to move.
+# The seed is fixed, so that every process computes the same keys.
+MAX_BOARD_SIZE = 26
+ZOBRIST = np.random.default_rng(0x4845).integers(0, 2 ** 63, size=(MAX_BOARD_SIZE ** 2, 3), dtype=np.uint64)
+ZOBRIST[:, 0] = 0
+ZOBRIST_PLAYER = np.random.default_rng(0x584548).integers(0, 2 ** 63, size=3, dtype=np.uint64)
+# Keys of each board size, for tables holding positions of several sizes (see classes/cache.py)
+ZOBRIST_SIZE = np.random.default_rng(0x53495a45).integers(0, 2 ** 63, size=MAX_BOARD_SIZE + 1, dtype=np.uint64)
+
+
+def zobrist_key(board: np.ndarray, player: int) -> int:
+    """
+    @return   A 64-bit hash of the position, i.e., the board and the player to move.
+    """
+    cells = np.asarray(board, dtype=np.int64).ravel()
+    stones = ZOBRIST[np.arange(len(cells)), cells]
+    return int(np.bitwise_xor.reduce(stones) ^ ZOBRIST_PLAYER[player])
+
+
+def params_key(*params) -> int:
+    """
+    @return   A hash of the given parameters, e.g., of the configuration of an engine, on 63 bits as the Zobrist keys,
+              which is the same in every process and every run, unlike hash.
+    """
+    digest = hashlib.blake2b(repr(params).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") >> 1
+
+
+def canonical_key(board: np.ndarray, player: int) -> tuple:
+    """
+    @return   The Zobrist key of the position or of its 180° rotation, whichever is smaller, i.e., the same key for both
+              positions, which are equivalent, and whether it is the key of the rotation.
+
+    Nodes of the rotation are read backwards: the node x * n + y becomes n * n - 1 - (x * n + y).
+    """
+    key, rotated_key = zobrist_key(board, player), zobrist_key(board[::-1, ::-1], player)
+    return (rotated_key, True) if rotated_key < key else (key, False)
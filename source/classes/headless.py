@@ -0,0 +1,28 @@
+class HeadlessUI:
+    def __init__(self, board_size: int, mode: str):
+        """
+        Stand-in for UI when no window is needed (batch runs).
+
+        Exposes the attributes that Logic and STRAT rely on, i.e., the board size, the mode,
+        the player numbers and the colour bookkeeping, without importing or initialising pygame.
+        """
+        self.board_size = board_size
+        self.mode = mode
+        assert 1 < self.board_size <= 26
+
+        # Colors
+        self.white = (255, 255, 255)
+        self.black = (40, 40, 40)
+        self.bg = (249,224,167)
+
+        # Players
+        self.BLACK_PLAYER = 1
+        self.WHITE_PLAYER = 2
+
+        self.color, self.node = [self.bg] * (self.board_size ** 2), None
+
+    def draw_board(self):
+        pass
+
+    def get_true_coordinates(self, node: int):
+        return int(node / self.board_size), node % self.board_size
@@ -0,0 +1,245 @@
+import argparse
+import time
+from importlib.util import find_spec
+
+import numpy as np
+
+from classes.utils import HEX_DIRECTIONS
+
+# Numba is optional: without it, Logic and Node keep their pure Python code.
+# It is only imported by warm_up, since importing it and loading the compiled kernels takes a while.
+AVAILABLE = find_spec("numba") is not None
+
+# Whether the kernels may be used (see use_kernels), and whether Logic and Node use them, i.e., once compiled
+enabled = AVAILABLE
+active = False
+
+# Compiled kernels, by name (see warm_up)
+compiled = {}
+
+
+def use_kernels(use: bool) -> None:
+    global enabled, active
+    enabled = use and AVAILABLE
+    active = enabled and bool(compiled)
+
+
+def warm_up() -> None:
+    """
+    Imports Numba, compiles the kernels (or loads them from the cache of Numba) and runs them once,
+    so that none of this is charged to the first timed move. Logic and Node use the kernels from then on.
+
+    Does nothing if the kernels are disabled, or already compiled.
+    """
+    global active
+    if not enabled or compiled:
+        return
+
+    from numba import njit
+
+    compiled["winning_component"] = njit(cache=True)(winning_component)
+    compiled["moves_to_explore"] = njit(cache=True)(moves_to_explore)
+    active = True
+
+    board = np.zeros((2, 2), dtype=np.int8)
+    game_over_path(board, 1)
+    explored_moves(board, 1)
+
+
+def neighbours(board_size: int) -> np.ndarray:
+    """
+    @return   The neighbours of each 1D node, in the order of Logic.get_neighbours, padded with -1 off the board.
+    """
+    table = np.full((board_size ** 2, 6), -1, dtype=np.int32)
+    for node in range(board_size ** 2):
+        x, y = divmod(node, board_size)
+        for index, (dx, dy) in enumerate(HEX_DIRECTIONS):
+            if 0 <= x + dx < board_size and 0 <= y + dy < board_size:
+                table[node, index] = (x + dx) * board_size + y + dy
+    return table
+
+
+# Neighbour tables, by board size
+NEIGHBOURS = {}
+
+
+def neighbour_table(board_size: int) -> np.ndarray:
+    if board_size not in NEIGHBOURS:
+        NEIGHBOURS[board_size] = neighbours(board_size)
+    return NEIGHBOURS[board_size]
+
+
+##################################################
+#                    KERNELS                     #
+##################################################
+# Boards are flat int8 arrays of 1D nodes (x * board_size + y), with 0 for a free node.
+# These functions are compiled by warm_up: as such, they are only slower versions of the pure Python code.
+
+def winning_component(cells, board_size, player, table, component):
+    """
+    Connected stones of "player", from the first node of his starting border (y = 0 for BLACK, x = 0 for WHITE)
+    whose stones reach the opposite border, as Logic.is_game_over: "component" is filled with them.
+
+    @return   Their number, or 0 if the player does not connect his borders.
+    """
+    visited = np.zeros(board_size * board_size, dtype=np.bool_)
+    for start in range(board_size):
+        node = start * board_size if player == 1 else start
+        if cells[node] != player or visited[node]:
+            continue
+
+        # Depth-first, the whole group of the start node
+        visited[node] = True
+        component[0] = node
+        size, top, connects = 1, 1, False
+        stack = np.empty(board_size * board_size, dtype=np.int32)
+        stack[0] = node
+        while top:
+            top -= 1
+            node = stack[top]
+            if player == 1 and node % board_size == board_size - 1 or \
+               player == 2 and node // board_size == board_size - 1:
+                connects = True
+            for neighbour in table[node]:
+                if neighbour >= 0 and not visited[neighbour] and cells[neighbour] == player:
+                    visited[neighbour] = True
+                    component[size] = neighbour
+                    stack[top] = neighbour
+                    size += 1
+                    top += 1
+        if connects:
+            return size
+    return 0
+
+
+def moves_to_explore(cells, board_size, player, table, moves):
+    """
+    Candidate moves of "player", as Node.get_moves_to_explore and in the same order: the free neighbours of the stones
+    of his opponent, then the free nodes of the lines through them and through his own stones, along his direction
+    (columns for BLACK, rows for WHITE) and across it respectively. "moves" is filled with them.
+
+    @return   Their number.
+    """
+    n_nodes = board_size * board_size
+    marked = np.zeros(n_nodes, dtype=np.bool_)
+    n_moves = 0
+
+    for node in range(n_nodes):
+        if cells[node] != 0 and cells[node] != player:
+            for neighbour in table[node]:
+                if neighbour >= 0 and cells[neighbour] == 0 and not marked[neighbour]:
+                    marked[neighbour] = True
+                    moves[n_moves] = neighbour
+                    n_moves += 1
+
+    # Free nodes of a line through each node, in turn, which are then no longer free
+    taken = cells.copy()
+    n_neighbours = n_moves
+    for step in range(2):
+        along = (player == 1) == (step == 0)
+        count = n_neighbours if step == 0 else n_nodes
+        for index in range(count):
+            node = moves[index] if step == 0 else index
+            if step == 1 and cells[node] != player:
+                continue
+            x, y = node // board_size, node % board_size
+            for delta in range(board_size):
+                other = delta * board_size + y if along else x * board_size + delta
+                if taken[other] == 0:
+                    taken[other] = player
+                    if not marked[other]:
+                        marked[other] = True
+                        moves[n_moves] = other
+                        n_moves += 1
+    return n_moves
+
+
+##################################################
+#                  WRAPPERS                      #
+##################################################
+
+def game_over_path(board: np.ndarray, player: int) -> dict:
+    """
+    @return   The path of Logic.is_game_over, i.e., the winning group of "player" if he connects his borders.
+    """
+    board_size = len(board)
+    component = np.empty(board_size ** 2, dtype=np.int32)
+    size = compiled["winning_component"](np.ascontiguousarray(board, dtype=np.int8).ravel(), board_size, player,
+                             neighbour_table(board_size), component)
+    if not size:
+        return None
+    return { "player": player, "nodes": { divmod(int(node), board_size): 1 for node in component[:size] } }
+
+
+def explored_moves(board: np.ndarray, player: int) -> list:
+    """
+    @return   The moves of Node.get_moves_to_explore, as (x, y).
+    """
+    board_size = len(board)
+    moves = np.empty(board_size ** 2, dtype=np.int32)
+    n_moves = compiled["moves_to_explore"](np.ascontiguousarray(board, dtype=np.int8).ravel(), board_size, player,
+                               neighbour_table(board_size), moves)
+    return [ divmod(int(node), board_size) for node in moves[:n_moves] ]
+
+
+##################################################
+#                  SELF-CHECK                    #
+##################################################
+
+def self_check(board_size: int, n_boards: int = 1000, seed: int = 0) -> float:
+    """
+    Compares the kernels with the pure Python code of Logic and Node on random boards that are not full,
+    played from the empty board, and raises an AssertionError at the first difference.
+
+    @return   How many times faster the kernels are, over all the checked calls.
+    """
+    from classes.headless import HeadlessUI
+    from classes.logic import Logic
+    from classes.strategy import Node
+
+    logic = Logic(HeadlessUI(board_size, "ai_vs_ai"))
+    rng = np.random.default_rng(seed)
+    boards = []
+    for _ in range(n_boards):
+        board = np.zeros((board_size, board_size), dtype=np.int8)
+        n_stones = rng.integers(0, board_size ** 2)
+        nodes = rng.permutation(board_size ** 2)[:n_stones]
+        board.ravel()[nodes] = np.arange(n_stones) % 2 + 1
+        boards.append(board)
+
+    warm_up()
+    nodes = [ Node(logic, board) for board in boards ]
+    elapsed = { False: 0.0, True: 0.0 }
+    results = {}
+    for use in (False, True):
+        use_kernels(use)
+        start_time = time.time()
+        results[use] = []
+        for board, node in zip(boards, nodes):
+            for player in (1, 2):
+                logic.GAME_OVER = False
+                path = logic.is_game_over(player, board)
+                results[use].append((path and len(path["nodes"]), path and path["nodes"],
+                                     node.get_moves_to_explore(logic, player)))
+        elapsed[use] = time.time() - start_time
+    use_kernels(True)
+
+    for index, (python, kernel) in enumerate(zip(results[False], results[True])):
+        assert python == kernel, f"kernels differ from Python on board {index // 2}:\n{boards[index // 2]}"
+    return elapsed[False] / max(elapsed[True], 1e-9)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks the compiled kernels against the pure Python code.")
+    parser.add_argument("--board-size", type=int, default=5)
+    parser.add_argument("--boards", type=int, default=1000, help="number of random boards")
+    options = parser.parse_args()
+    assert AVAILABLE, "Numba is not installed: only the pure Python code is available"
+
+    # As a script, this module is not the one that Logic and Node use
+    from classes import kernels
+
+    # Compile first
+    kernels.self_check(options.board_size, 1)
+    speedup = kernels.self_check(options.board_size, options.boards)
+    print(f"Kernels agree with Python on {options.boards} boards ({speedup:.1f}x faster)")
@@ -3,12 +3,16 @@ from typing import Optional
 import numpy as np
 import random as rd
 
+from classes import kernels
 from classes.strategy import STRAT
 
 
 class Logic:
-    def __init__(self, ui):
+    def __init__(self, ui, strategies: Optional[dict] = None, priors=None):
         self.ui = ui
+        self.strategies = strategies or {}
+        self.priors = priors
+        self.history = []
         self.GAME_OVER = False
         self.logger = np.zeros(shape=(self.ui.board_size, self.ui.board_size), dtype=np.int8)
 
@@ -36,9 +40,16 @@ class Logic:
 
         As a side-effect, sets GAME_OVER to True if there are no more moves to play.
         """
-        if self.get_possible_moves(board) == []:
+        if not (board == 0).any():
             self.GAME_OVER = True
 
+        # Compiled connectivity check (see classes/kernels.py), unless the game is already over
+        if kernels.active and not self.GAME_OVER:
+            path = kernels.game_over_path(board, player)
+            if path is not None:
+                self.GAME_OVER = True
+            return path
+
         for _ in range(self.ui.board_size):
             if player is self.ui.BLACK_PLAYER:
                 border = (_, 0)
@@ -119,19 +130,22 @@ class Logic:
             else:
                 # Debug: random player
                 #    x, y = rd.choice(self.get_possible_moves(self.logger))
-                self.strategy = STRAT(logic=self, ui=self.ui, board_state=self.logger, starting_player=self.ui.BLACK_PLAYER)
+                self.strategy = STRAT(logic=self, ui=self.ui, board_state=self.logger, starting_player=self.ui.BLACK_PLAYER,
+                                      strategy=self.strategies.get(self.ui.BLACK_PLAYER), priors=self.priors)
                 (x, y) = self.strategy.start()
         elif player is self.ui.WHITE_PLAYER:
             # AI player
             # Debug: random player
             #  x, y = rd.choice(self.get_possible_moves(self.logger))
-            self.strategy = STRAT(logic=self, ui=self.ui, board_state=self.logger, starting_player=self.ui.WHITE_PLAYER)
+            self.strategy = STRAT(logic=self, ui=self.ui, board_state=self.logger, starting_player=self.ui.WHITE_PLAYER,
+                                  strategy=self.strategies.get(self.ui.WHITE_PLAYER), priors=self.priors)
             (x, y) = self.strategy.start()
 
         assert self.is_node_free((x, y), self.logger), "node is busy"
 
         self.make_move((x, y), player)
         self.logger[x][y] = player
+        self.history.append((x, y, player))
 
         is_game_over = self.is_game_over(player, self.logger)
         return None if is_game_over is None else is_game_over["player"]
\ No newline at end of file
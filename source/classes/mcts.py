@@ -0,0 +1,133 @@
+from collections import namedtuple
+from math import log
+from random import choice
+
+import numpy as np
+
+from classes.bitboard import Bitboard
+from classes.playout import bridge_playout, random_playout
+from classes.tree import TreeStore, EXPANDED, TERMINAL
+
+# Node reached by a selection, with its position, i.e., the stones of both players and the player to move,
+# and whether the player who moved to it has won
+Leaf = namedtuple("Leaf", ["node", "black", "white", "player", "terminal"])
+
+
+def min_capacity(board_size: int) -> int:
+    """
+    @return   The smallest tree store of a search, i.e., the root and one child per node of the board.
+    """
+    return board_size ** 2 + 1
+
+
+class MCTS:
+    def __init__(self, board_size: int, capacity: int = 100000, exploration: float = 1.4,
+                 playout: str = "random", patterns=None):
+        """
+        Monte-Carlo tree search (UCT) on a TreeStore of at most "capacity" nodes.
+
+        Playouts are either "random" or "bridge" (see classes/playout.py), the latter with pattern replies
+        when a PatternScorer is given as "patterns".
+
+        Nodes hold no board: the position of a node is rebuilt on bitboards along the path from the root.
+        Selection and evaluation are separate steps, so that leaves of many searches can be evaluated together.
+
+        The capacity must hold at least the root and its children on the empty board (see min_capacity).
+        """
+        if capacity < min_capacity(board_size):
+            raise ValueError(f"capacity {capacity} of the MCTS tree is too small for a {board_size}x{board_size} board, "
+                             f"which needs at least {min_capacity(board_size)} nodes")
+        self.board_size = board_size
+        self.bitboard = Bitboard(board_size)
+        self.tree = TreeStore(capacity)
+        self.exploration = exploration
+        self.playout = playout
+        self.patterns = patterns
+        self.black, self.white, self.player = 0, 0, 1
+
+    def reset(self, board: np.ndarray, player: int) -> None:
+        """
+        Starts a new search from the given board, where it is the turn of "player".
+        """
+        self.tree.reset()
+        self.black, self.white = self.bitboard.from_board(board)
+        self.player = player
+
+    def select(self) -> Leaf:
+        """
+        Descends from the root to a leaf, expanding the leaf if it has already been visited.
+        """
+        tree, bitboard = self.tree, self.bitboard
+        if tree.is_full(self.board_size ** 2):
+            tree.prune()
+
+        # Selection
+        node, player = tree.ROOT, self.player
+        stones = [ 0, self.black, self.white ]
+        while tree.flags[node] & EXPANDED:
+            node = self.uct_child(node)
+            stones[player] |= 1 << int(tree.move[node])
+            player = 3 - player
+
+        # Expansion, once the node has been visited
+        mover = 3 - player
+        terminal = bool(tree.flags[node] & TERMINAL) or node != tree.ROOT and bitboard.connects(stones[mover], mover)
+        if not terminal and (tree.visits[node] or node == tree.ROOT):
+            free = bitboard.full & ~(stones[1] | stones[2])
+            moves = [ move for move in range(self.board_size ** 2) if free >> move & 1 ]
+            if not tree.is_full(len(moves)):
+                tree.expand(node, moves)
+                node = tree.first_child[node] + np.random.randint(len(moves))
+                stones[player] |= 1 << int(tree.move[node])
+                player, mover = mover, player
+                terminal = bitboard.connects(stones[mover], mover)
+
+        if terminal:
+            tree.flags[node] |= TERMINAL
+        return Leaf(node, stones[1], stones[2], player, terminal)
+
+    def update(self, leaf: Leaf, winner: int) -> None:
+        """
+        Backpropagates the winner of the game from the leaf.
+        """
+        self.tree.backpropagate(leaf.node, 1 if winner == 3 - leaf.player else 0)
+
+    def evaluate(self, leaf: Leaf) -> int:
+        """
+        @return   The winner from the leaf, i.e., the player who moved to it if terminal, or else that of a playout.
+        """
+        if leaf.terminal:
+            return 3 - leaf.player
+        if self.playout == "bridge":
+            last_move = None if leaf.node == self.tree.ROOT else int(self.tree.move[leaf.node])
+            return bridge_playout(self.bitboard, leaf.black, leaf.white, leaf.player, last_move, self.patterns)
+        assert self.playout == "random", f"unknown playout {self.playout}"
+        return random_playout(self.bitboard, leaf.black, leaf.white, leaf.player)
+
+    def search(self, iterations: int) -> None:
+        for _ in range(iterations):
+            leaf = self.select()
+            self.update(leaf, self.evaluate(leaf))
+
+    def best_move(self) -> tuple:
+        """
+        @return   The most visited move of the root, as (x, y).
+        """
+        children = self.tree.children(self.tree.ROOT)
+        best = children[int(np.argmax(self.tree.visits[children.start:children.stop]))]
+        return divmod(int(self.tree.move[best]), self.board_size)
+
+    def uct_child(self, node: int) -> int:
+        """
+        @return   The child of the node to explore, i.e., an unvisited one if any, or the best one according to UCB1.
+        """
+        tree = self.tree
+        children = tree.children(node)
+        visits = tree.visits[children.start:children.stop]
+        unvisited = np.flatnonzero(visits == 0)
+        if len(unvisited):
+            return children.start + int(choice(unvisited))
+
+        values = tree.value[children.start:children.stop]
+        scores = values / visits + self.exploration * np.sqrt(log(tree.visits[node]) / visits)
+        return children.start + int(np.argmax(scores))
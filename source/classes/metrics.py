@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from math import inf
+from typing import Optional
+
+# Upper bounds (in seconds) of the buckets of the move latency histogram
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60, inf)
+
+
+class Metrics:
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        """
+        Live counters of a running tournament: games, moves and search nodes, and a histogram of the time
+        taken by each player to play a move, rendered in the Prometheus text exposition format.
+
+        Moves are counted as soon as they are played (see add_move), and games when they end (see add_game).
+        Search nodes are those of Node.count, i.e., the tree nodes created by the minimax searches,
+        but the iterations (one tree node and one playout each) of the MCTS searches.
+        """
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.buckets = buckets
+        self.games = 0
+        self.wins = { 1: 0, 2: 0 }
+        self.nodes = 0
+        self.latency_counts = { player: [ 0 ] * len(buckets) for player in (1, 2) }
+        self.latency_sums = { 1: 0.0, 2: 0.0 }
+
+    def add_game(self, winner: int) -> None:
+        """
+        Counts a finished game.
+        """
+        with self.lock:
+            self.games += 1
+            self.wins[winner] += 1
+
+    def add_move(self, player: int, seconds: float, nodes: int) -> None:
+        """
+        Counts a move of an AI player, with the time taken to play it and the number of search nodes.
+        """
+        with self.lock:
+            self.nodes += nodes
+            self.observe_move(player, seconds)
+
+    def drain(self, moves) -> None:
+        """
+        Counts the moves of the (player, seconds, nodes) queue, e.g., sent by worker processes, until None.
+        """
+        for move in iter(moves.get, None):
+            self.add_move(*move)
+
+    def observe_move(self, player: int, seconds: float) -> None:
+        counts = self.latency_counts[player]
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                counts[index] += 1
+        self.latency_sums[player] += seconds
+
+    def render(self) -> str:
+        """
+        @return   The metrics in the Prometheus text exposition format.
+        """
+        with self.lock:
+            elapsed = max(time.time() - self.start_time, 1e-9)
+            moves = sum(counts[-1] for counts in self.latency_counts.values())
+            lines = [ "# HELP hex_games_total Games played.",
+                      "# TYPE hex_games_total counter",
+                      f"hex_games_total {self.games}",
+                      "# HELP hex_wins_total Games won by each player.",
+                      "# TYPE hex_wins_total counter" ]
+            lines += [ f'hex_wins_total{{player="{player}"}} {wins}' for player, wins in self.wins.items() ]
+            lines += [ "# HELP hex_moves_total Moves played by the AI players.",
+                       "# TYPE hex_moves_total counter",
+                       f"hex_moves_total {moves}",
+                       "# HELP hex_search_nodes_total Nodes created by the searches of the AI players "
+                       "(iterations for MCTS).",
+                       "# TYPE hex_search_nodes_total counter",
+                       f"hex_search_nodes_total {self.nodes}",
+                       "# HELP hex_elapsed_seconds Time since the start of the tournament.",
+                       "# TYPE hex_elapsed_seconds gauge",
+                       f"hex_elapsed_seconds {elapsed:.3f}",
+                       "# HELP hex_throughput Average number of games, moves and search nodes (iterations for MCTS) "
+                       "per second since the start.",
+                       "# TYPE hex_throughput gauge",
+                       f'hex_throughput{{unit="games"}} {self.games / elapsed:.6f}',
+                       f'hex_throughput{{unit="moves"}} {moves / elapsed:.6f}',
+                       f'hex_throughput{{unit="nodes"}} {self.nodes / elapsed:.6f}',
+                       "# HELP hex_move_latency_seconds Time taken by each player to play a move.",
+                       "# TYPE hex_move_latency_seconds histogram" ]
+            for player, counts in self.latency_counts.items():
+                for bound, count in zip(self.buckets, counts):
+                    le = "+Inf" if bound == inf else repr(float(bound))
+                    lines.append(f'hex_move_latency_seconds_bucket{{player="{player}",le="{le}"}} {count}')
+                lines.append(f'hex_move_latency_seconds_sum{{player="{player}"}} {self.latency_sums[player]:.6f}')
+                lines.append(f'hex_move_latency_seconds_count{{player="{player}"}} {counts[-1]}')
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    def __init__(self, metrics: Metrics, port: Optional[int] = None, path: Optional[str] = None, interval: float = 5):
+        """
+        Exports the metrics while a tournament runs, from background threads: on http://localhost:<port>/metrics
+        and/or in a text file rewritten every "interval" seconds (e.g., for the textfile collector of node_exporter).
+        """
+        self.metrics = metrics
+        self.port = port
+        self.path = path
+        self.interval = interval
+        self.server = None
+        self.stopped = threading.Event()
+        self.writer = None
+
+    def start(self) -> None:
+        if self.port is not None:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            metrics = self.metrics
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = metrics.render().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self.server = ThreadingHTTPServer(("localhost", self.port), Handler)
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        if self.path is not None:
+            self.writer = threading.Thread(target=self.write_periodically, daemon=True)
+            self.writer.start()
+
+    def write(self) -> None:
+        """
+        Rewrites the metrics file atomically, so that a scraper never reads it half-written.
+        """
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as file:
+            file.write(self.metrics.render())
+        os.replace(temporary, self.path)
+
+    def write_periodically(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.write()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.writer is not None:
+            self.writer.join()
+            self.write()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
@@ -0,0 +1,122 @@
+import argparse
+import hashlib
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from classes.records import load_records
+from classes.utils import HEX_DIRECTIONS, BRIDGE_DIRECTIONS
+
+# State of a cell as seen by the player to move
+EMPTY, OWN, OTHER, OFF_BOARD = 0, 1, 2, 3
+
+# A pattern is the state of six cells, i.e., a base-4 number of six digits
+N_PATTERNS = 4 ** 6
+
+# Kinds of patterns: the six neighbours and the six two-bridge ends of a node
+NEIGHBOURS, BRIDGES = 0, 1
+PATTERN_OFFSETS = { NEIGHBOURS: HEX_DIRECTIONS,
+                    BRIDGES:    [ end for (end, _, _) in BRIDGE_DIRECTIONS ] }
+
+
+def relative_board(board: np.ndarray, player: int) -> np.ndarray:
+    """
+    @return   The board seen by the player, padded by two rings of OFF_BOARD cells.
+
+    The board is transposed for the WHITE player, so that the player always connects the left and right borders.
+    Since the neighbourhood of a node is symmetric with respect to the transposition, patterns are shared by both players.
+    """
+    board_size = len(board)
+    inner = np.where(board == player, OWN, np.where(board == 0, EMPTY, OTHER))
+    if player == 2:
+        inner = inner.T
+
+    relative = np.full((board_size + 4, board_size + 4), OFF_BOARD, dtype=np.int64)
+    relative[2:-2, 2:-2] = inner
+    return relative
+
+
+def pattern_codes(board: np.ndarray, player: int) -> np.ndarray:
+    """
+    @return   An array of shape (2, board_size, board_size) with the code of the NEIGHBOURS and BRIDGES patterns around each node.
+    """
+    board_size = len(board)
+    relative = relative_board(board, player)
+
+    codes = np.zeros((2, board_size, board_size), dtype=np.int64)
+    for kind, offsets in PATTERN_OFFSETS.items():
+        for digit, (dx, dy) in enumerate(offsets):
+            codes[kind] += relative[2 + dx : 2 + dx + board_size, 2 + dy : 2 + dy + board_size] * 4 ** digit
+
+    if player == 2:
+        codes = codes.transpose(0, 2, 1)
+    return codes
+
+
+def train(records: Iterable[dict], winners_only: bool = True) -> np.ndarray:
+    """
+    Learns the weight of each pattern from recorded games.
+
+    The weight of a pattern is the log-frequency at which a free node showing this pattern was actually played,
+    with add-one smoothing, so that unseen patterns keep a neutral weight.
+
+    @return   An array of shape (2, N_PATTERNS) with the weights of the NEIGHBOURS and BRIDGES patterns.
+    """
+    played = np.zeros((2, N_PATTERNS))
+    seen = np.zeros((2, N_PATTERNS))
+
+    for record in records:
+        board = np.zeros((record["board_size"], record["board_size"]), dtype=np.int8)
+        for x, y, player in record["moves"]:
+            if not winners_only or player == record["winner"]:
+                codes = pattern_codes(board, player)
+                free = board == 0
+                for kind in PATTERN_OFFSETS:
+                    np.add.at(seen[kind], codes[kind][free], 1)
+                    played[kind][codes[kind][x][y]] += 1
+            board[x][y] = player
+
+    return np.log((played + 1) / (seen + 2)).astype(np.float32)
+
+
+def save_weights(path: str, weights: np.ndarray) -> None:
+    np.savez_compressed(path, weights=weights)
+
+
+class PatternScorer:
+    def __init__(self, path: str, width: Optional[int] = None):
+        """
+        Loads a weight table written by save_weights.
+
+        At most "width" candidate moves are kept by rank (all of them if None).
+        """
+        self.weights = np.load(path)["weights"]
+        self.width = width
+        # What decides the ranked moves, i.e., the weights and the width, e.g., to tell apart the searches using them
+        self.digest = hashlib.blake2b(self.weights.tobytes(), digest_size=8).hexdigest() + f"/{width}"
+
+    def scores(self, board: np.ndarray, player: int) -> np.ndarray:
+        """
+        @return   The score of playing each node of the board for the player, as a sum of table lookups.
+        """
+        codes = pattern_codes(board, player)
+        return self.weights[NEIGHBOURS][codes[NEIGHBOURS]] + self.weights[BRIDGES][codes[BRIDGES]]
+
+    def rank(self, board: np.ndarray, moves: List[tuple], player: int) -> List[tuple]:
+        """
+        @return   The given moves from best to worst score, pruned to the width of the scorer.
+        """
+        scores = self.scores(board, player)
+        ranked = sorted(moves, key=lambda move: -scores[move[0]][move[1]])
+        return ranked[:self.width] if self.width else ranked
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Learns pattern weights from recorded games.")
+    parser.add_argument("records", nargs="+", help="JSON-lines files of recorded games")
+    parser.add_argument("-o", "--output", default="patterns.npz", help="weight table to write")
+    parser.add_argument("--all-moves", action="store_true", help="learn from the moves of the loser too")
+    options = parser.parse_args()
+
+    records = (record for path in options.records for record in load_records(path))
+    save_weights(options.output, train(records, winners_only=not options.all_moves))
@@ -0,0 +1,177 @@
+from functools import lru_cache
+from random import random, shuffle
+from typing import Optional
+
+import numpy as np
+
+from classes.bitboard import Bitboard
+from classes.utils import HEX_DIRECTIONS, BRIDGE_DIRECTIONS
+
+
+def random_playout(bitboard: Bitboard, black: int, white: int, player: int) -> int:
+    """
+    Fills the free nodes of the board at random, the players taking turns from "player".
+
+    A full board of Hex always has exactly one winner, so that a single connectivity check is needed.
+
+    @return   The winner, i.e., either 1 or 2.
+    """
+    free = [ node for node in range(bitboard.board_size ** 2) if not (black | white) >> node & 1 ]
+    shuffle(free)
+
+    # The player to move gets the first, third, ... free nodes
+    stones = sum(1 << node for node in free[::2])
+    if player == 1:
+        black |= stones
+    else:
+        black |= sum(1 << node for node in free[1::2])
+    return 1 if bitboard.connects(black, 1) else 2
+
+
+@lru_cache(maxsize=None)
+def bridge_table(board_size: int) -> tuple:
+    """
+    @return   For each node, the two-bridges it is a carrier of, as (the other carrier, the bitboard of both ends).
+    """
+    def is_valid(x, y):
+        return 0 <= x < board_size and 0 <= y < board_size
+
+    intrusions = [ set() for _ in range(board_size ** 2) ]
+    for x in range(board_size):
+        for y in range(board_size):
+            for (ex, ey), (ax, ay), (bx, by) in BRIDGE_DIRECTIONS:
+                end, first, second = (x + ex, y + ey), (x + ax, y + ay), (x + bx, y + by)
+                if not all(is_valid(*node) for node in (end, first, second)):
+                    continue
+                ends = 1 << x * board_size + y | 1 << end[0] * board_size + end[1]
+                first, second = first[0] * board_size + first[1], second[0] * board_size + second[1]
+                intrusions[first].add((second, ends))
+                intrusions[second].add((first, ends))
+
+    return tuple(tuple(sorted(bridges)) for bridges in intrusions)
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(board_size: int) -> tuple:
+    """
+    @return   For each node and each player, the neighbours of the node in the order of the patterns of this player
+              (see classes/patterns.py, where the board is transposed for the WHITE player), None when off-board.
+    """
+    offsets = { 1: HEX_DIRECTIONS,
+                2: [ (dy, dx) for dx, dy in HEX_DIRECTIONS ] }
+
+    table = []
+    for node in range(board_size ** 2):
+        x, y = divmod(node, board_size)
+        table.append({ player: tuple((x + dx) * board_size + y + dy
+                                     if 0 <= x + dx < board_size and 0 <= y + dy < board_size else None
+                                     for dx, dy in offsets[player])
+                       for player in (1, 2) })
+    return tuple(table)
+
+
+def bridge_playout(bitboard: Bitboard, black: int, white: int, player: int, last_move: Optional[int] = None,
+                   patterns=None, pattern_rate: float = 0.5) -> int:
+    """
+    Fills the free nodes of the board, the players taking turns from "player", at random but for the replies to
+    intrusions: when a player intrudes into a two-bridge of his opponent, the opponent saves it by playing the other carrier.
+
+    With a PatternScorer as "patterns", otherwise random moves are, with probability "pattern_rate", replaced by the
+    free neighbour of the last move with the best NEIGHBOURS pattern weight.
+
+    @return   The winner, i.e., either 1 or 2.
+    """
+    n_nodes = bitboard.board_size ** 2
+    intrusions = bridge_table(bitboard.board_size)
+    neighbours = neighbour_table(bitboard.board_size) if patterns is not None else None
+
+    stones = [ 0, black, white ]
+    occupied = black | white
+    free = [ node for node in range(n_nodes) if not occupied >> node & 1 ]
+    shuffle(free)
+
+    for _ in range(len(free)):
+        move = None
+        if last_move is not None:
+            for carrier, ends in intrusions[last_move]:
+                if stones[player] & ends == ends and not occupied >> carrier & 1:
+                    move = carrier
+                    break
+
+            if move is None and neighbours is not None and random() < pattern_rate:
+                move = best_pattern_reply(patterns, neighbours, stones, occupied, player, last_move)
+
+        if move is None:
+            move = free.pop()
+            while occupied >> move & 1:
+                move = free.pop()
+
+        stones[player] |= 1 << move
+        occupied |= 1 << move
+        last_move, player = move, 3 - player
+
+    return 1 if bitboard.connects(stones[1], 1) else 2
+
+
+def best_pattern_reply(patterns, neighbours: tuple, stones: list, occupied: int, player: int, last_move: int) -> Optional[int]:
+    """
+    @return   The free neighbour of the last move with the best NEIGHBOURS pattern weight for the player, if any.
+    """
+    from classes.patterns import NEIGHBOURS, EMPTY, OWN, OTHER, OFF_BOARD
+
+    weights = patterns.weights[NEIGHBOURS]
+    best, best_weight = None, None
+    for node in neighbours[last_move][player]:
+        if node is None or occupied >> node & 1:
+            continue
+        code = 0
+        for digit, neighbour in enumerate(neighbours[node][player]):
+            state = OFF_BOARD if neighbour is None else \
+                    OWN if stones[player] >> neighbour & 1 else OTHER if occupied >> neighbour & 1 else EMPTY
+            code += state * 4 ** digit
+        if best is None or weights[code] > best_weight:
+            best, best_weight = node, weights[code]
+    return best
+
+
+def batch_winners(boards: np.ndarray) -> np.ndarray:
+    """
+    @return   The winner of each full board of an array of shape (n_boards, board_size, board_size),
+              by a flood fill of the BLACK stones from the left column, run on all boards at once.
+    """
+    black = boards == 1
+    reached = np.zeros_like(black)
+    reached[:, :, 0] = black[:, :, 0]
+
+    padded = np.zeros((len(boards), boards.shape[1] + 2, boards.shape[2] + 2), dtype=bool)
+    while True:
+        padded[:, 1:-1, 1:-1] = reached
+        extended = reached.copy()
+        for dx, dy in HEX_DIRECTIONS:
+            extended |= padded[:, 1 + dx : padded.shape[1] - 1 + dx, 1 + dy : padded.shape[2] - 1 + dy]
+        extended &= black
+        if (extended == reached).all():
+            break
+        reached = extended
+
+    return np.where(reached[:, :, -1].any(axis=1), 1, 2)
+
+
+def batch_playouts(boards: np.ndarray, players: np.ndarray) -> np.ndarray:
+    """
+    Fills the free nodes of many boards at random in one go, the players taking turns from the given players to move.
+
+    @return   The winner of each board, i.e., either 1 or 2.
+    """
+    n_boards, board_size, _ = boards.shape
+    cells = boards.reshape(n_boards, -1)
+    free = cells == 0
+
+    # Random order of the free nodes: the player to move gets the first, third, ... of them
+    keys = np.where(free, np.random.random(cells.shape), 2)
+    rank = np.empty_like(cells, dtype=np.int64)
+    rank[np.arange(n_boards)[:, None], np.argsort(keys, axis=1)] = np.arange(cells.shape[1])
+
+    players = np.asarray(players)[:, None]
+    filled = np.where(free, np.where(rank % 2 == 0, players, 3 - players), cells)
+    return batch_winners(filled.reshape(boards.shape))
@@ -0,0 +1,31 @@
+import json
+from typing import Iterator, List
+
+
+def game_record(board_size: int, black_starts: bool, moves: List[tuple], winner: int, strategies: dict) -> dict:
+    """
+    @return   A JSON-serialisable record of a finished game, where moves are (x, y, player) triples in playing order.
+    """
+    return { "board_size":   board_size,
+             "black_starts": black_starts,
+             "strategies":   { str(player): name for player, name in strategies.items() },
+             "moves":        [ [int(x), int(y), int(player)] for (x, y, player) in moves ],
+             "winner":       winner }
+
+
+def save_record(path: str, record: dict) -> None:
+    """
+    Appends a game record to a JSON-lines file.
+    """
+    with open(path, "a") as file:
+        file.write(json.dumps(record) + "\n")
+
+
+def load_records(path: str) -> Iterator[dict]:
+    """
+    @return   The game records of a JSON-lines file, in order.
+    """
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,75 @@
+# Registry of the engines that STRAT can play.
+#
+# An engine is a STRAT method together with its parameters, e.g., the search depth or whether the move
+# heuristic is used. Engines are referred to by name, optionally followed by parameter overrides, e.g.,
+# "minimaxAB:depth=2,moves_heuristic=1".
+
+from typing import Optional
+
+ENGINES = {}
+
+# Playout policies of the MCTS engine (see classes/playout.py)
+PLAYOUTS = ("random", "bridge")
+
+
+def register(name: str, method: str, choices: Optional[dict] = None, **params) -> None:
+    """
+    Registers a STRAT method under the given name, with its default parameters,
+    and the allowed values of those parameters that only take a few ("choices", by parameter).
+    """
+    ENGINES[name] = { "method": method, "params": params, "choices": choices or {} }
+
+
+def parse_value(value: str):
+    """
+    @return   The value of a parameter override, either a boolean (true or false, in any case), an integer, a float
+              or a string.
+    """
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    for kind in (int, float):
+        try:
+            return kind(value)
+        except ValueError:
+            pass
+    return value
+
+
+def resolve(spec: str) -> tuple:
+    """
+    @return   The method and the parameters of the engine described by "spec", i.e., "name" or "name:key=value,...".
+    """
+    name, _, overrides = spec.partition(":")
+    assert name in ENGINES, f"unknown engine {name}, expected one of {', '.join(ENGINES)}"
+
+    params = dict(ENGINES[name]["params"])
+    for override in filter(None, overrides.split(",")):
+        key, _, value = override.partition("=")
+        assert key in params, f"unknown parameter {key} for engine {name}, expected one of {', '.join(params)}"
+        params[key] = parse_value(value)
+        choices = ENGINES[name]["choices"].get(key)
+        assert choices is None or params[key] in choices, \
+               f"invalid {key} {value!r} for engine {name}, expected one of {', '.join(map(str, choices))}"
+
+    return ENGINES[name]["method"], params
+
+
+def engine_spec(spec: str) -> str:
+    """
+    Validates an engine description (for argparse).
+    """
+    try:
+        resolve(spec)
+    except AssertionError as error:
+        import argparse
+        raise argparse.ArgumentTypeError(str(error))
+    return spec
+
+
+register("random",               "random_strategy")
+register("minimax",              "minimax_strategy",     depth=4, moves_heuristic=0)
+register("minimaxAB",            "minimaxAB_strategy",   depth=4, moves_heuristic=0)
+register("minimaxAB_bestChoice", "minimaxAB_bestChoice", depth=4, moves_heuristic=1)
+register("mcts",                 "mcts_strategy",        iterations=1000, exploration=1.4, capacity=100000,
+                                                         playout="random", choices={ "playout": PLAYOUTS })
+register("solved",               "solved_strategy",      table="", depth=4, live_size=4)
@@ -0,0 +1,104 @@
+import os
+import sys
+
+import numpy as np
+
+# Hide Pygame welcome message
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+import pygame
+
+from classes.logic import Logic
+from classes.ui import UI
+
+
+class Replay:
+    def __init__(self, record: dict, speed: float = 2, snapshot_every: int = 8):
+        """
+        Replays a recorded game (see classes/records.py) through Logic.make_move and the UI, without any search.
+
+        Plies are played at "speed" plies per second, possibly several per frame. A snapshot of the board is kept every
+        "snapshot_every" plies, so that seeking to any ply replays at most that many moves.
+
+        Controls: SPACE pauses/resumes, LEFT/RIGHT steps one ply, HOME/END goes to the start/end,
+        UP/DOWN doubles/halves the speed, ESCAPE quits.
+        """
+        self.moves = [ (x, y, player) for x, y, player in record["moves"] ]
+        self.winner = record["winner"]
+        self.speed = speed
+        self.snapshot_every = snapshot_every
+
+        pygame.init()
+        self.ui = UI(record["board_size"], "replay")
+        self.logic = Logic(self.ui)
+
+        # Board after every "snapshot_every" plies, from the empty board
+        board = np.zeros((self.ui.board_size, self.ui.board_size), dtype=np.int8)
+        self.snapshots = [ board.copy() ]
+        for ply, (x, y, player) in enumerate(self.moves, start=1):
+            board[x][y] = player
+            if ply % snapshot_every == 0:
+                self.snapshots.append(board.copy())
+
+        self.ply = 0
+        self.playing = True
+        self.elapsed = 0.0
+
+    def apply(self, ply: int) -> None:
+        """
+        Plays the move of the given ply (counted from 1) on the board and the UI.
+        """
+        x, y, player = self.moves[ply - 1]
+        self.logic.make_move((x, y), player)
+        self.logic.logger[x][y] = player
+
+    def seek(self, ply: int) -> None:
+        """
+        Shows the board after the given ply: forward, by applying the next moves; backward (or far forward),
+        by restoring the closest snapshot before it and applying the remaining moves.
+        """
+        ply = max(0, min(ply, len(self.moves)))
+        if ply < self.ply or ply - self.ply > self.snapshot_every:
+            snapshot = ply // self.snapshot_every
+            self.logic.logger = self.snapshots[snapshot].copy()
+            colors = { 0: self.ui.bg, self.ui.BLACK_PLAYER: self.ui.black, self.ui.WHITE_PLAYER: self.ui.white }
+            self.ui.color = [ colors[cell] for cell in self.logic.logger.ravel() ]
+            self.ply = snapshot * self.snapshot_every
+
+        while self.ply < ply:
+            self.ply += 1
+            self.apply(self.ply)
+
+    def handle_events(self) -> None:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN:
+                if   event.key == pygame.K_SPACE:   self.playing = not self.playing
+                elif event.key == pygame.K_RIGHT:   self.seek(self.ply + 1)
+                elif event.key == pygame.K_LEFT:    self.seek(self.ply - 1)
+                elif event.key == pygame.K_HOME:    self.seek(0)
+                elif event.key == pygame.K_END:     self.seek(len(self.moves))
+                elif event.key == pygame.K_UP:      self.speed *= 2
+                elif event.key == pygame.K_DOWN:    self.speed /= 2
+
+    def run(self) -> None:
+        while True:
+            self.handle_events()
+
+            # Fast-forward: as many plies as the speed allows since the last frame
+            seconds = self.ui.clock.tick(30) / 1000
+            if self.playing and self.ply < len(self.moves):
+                self.elapsed += seconds * self.speed
+                if self.elapsed >= 1:
+                    self.seek(self.ply + int(self.elapsed))
+                    self.elapsed -= int(self.elapsed)
+            else:
+                self.elapsed = 0.0
+
+            state = "Player {} wins".format(self.winner) if self.ply == len(self.moves) else \
+                    "playing" if self.playing else "paused"
+            pygame.display.set_caption(f"Polyline replay - ply {self.ply}/{len(self.moves)} - "
+                                       f"{self.speed:g} plies/s - {state}")
+            self.ui.draw_board()
+            pygame.display.update()
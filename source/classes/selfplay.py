@@ -0,0 +1,97 @@
+import time
+from typing import Optional
+
+import numpy as np
+
+from classes.mcts import MCTS
+from classes.playout import batch_playouts
+from classes.records import game_record, save_record
+
+
+class SelfPlay:
+    def __init__(self, board_size: int, n_games: int, iterations: int = 200, exploration: float = 1.4,
+                 capacity: Optional[int] = None, record: Optional[str] = None):
+        """
+        Self-play of many independent games between MCTS players, advanced in lockstep in a single process.
+
+        At each step of a move, every game selects one leaf of its own search; the leaves that are not terminal are
+        then evaluated by a single batch of random playouts (see batch_playouts), before every search is updated.
+
+        The BLACK player starts every other game. Finished games are appended to the "record" JSON-lines file, if any.
+        """
+        self.board_size = board_size
+        self.n_games = n_games
+        self.iterations = iterations
+        self.record = record
+
+        # Each expansion adds at most one child per node of the board
+        capacity = capacity or iterations * board_size ** 2 + 1
+        self.searchers = [ MCTS(board_size, capacity, exploration) for _ in range(n_games) ]
+
+    def run(self) -> list:
+        """
+        Plays all the games.
+
+        @return   The winner of each game, i.e., either 1 or 2.
+        """
+        board_size = self.board_size
+        boards = np.zeros((self.n_games, board_size, board_size), dtype=np.int8)
+        players = np.array([ 1 if game % 2 == 0 else 2 for game in range(self.n_games) ])
+        black_starts = players == 1
+        histories = [ [] for _ in range(self.n_games) ]
+        winners = [ None ] * self.n_games
+        active = list(range(self.n_games))
+
+        start_time = time.time()
+        while active:
+            for game in active:
+                self.searchers[game].reset(boards[game], players[game])
+
+            for _ in range(self.iterations):
+                leaves = [ self.searchers[game].select() for game in active ]
+                pending = [ index for index, leaf in enumerate(leaves) if not leaf.terminal ]
+
+                results = [ 3 - leaf.player for leaf in leaves ]
+                if pending:
+                    leaf_boards = np.stack([ self.leaf_board(leaves[index]) for index in pending ])
+                    leaf_players = np.array([ leaves[index].player for index in pending ])
+                    for index, winner in zip(pending, batch_playouts(leaf_boards, leaf_players)):
+                        results[index] = winner
+
+                for game, leaf, winner in zip(active, leaves, results):
+                    self.searchers[game].update(leaf, winner)
+
+            for game in active:
+                x, y = self.searchers[game].best_move()
+                player = players[game]
+                boards[game][x][y] = player
+                histories[game].append((x, y, player))
+
+                black, white = self.searchers[game].bitboard.from_board(boards[game])
+                if self.searchers[game].bitboard.connects(black if player == 1 else white, player):
+                    winners[game] = int(player)
+                players[game] = 3 - player
+
+            active = [ game for game in active if winners[game] is None ]
+
+        elapsed = time.time() - start_time
+        if self.record is not None:
+            for game in range(self.n_games):
+                save_record(self.record, game_record(board_size, bool(black_starts[game]), histories[game],
+                                                     winners[game], { 1: "mcts", 2: "mcts" }))
+
+        n_moves = sum(len(history) for history in histories)
+        print(f"\n{self.n_games} games, {n_moves} moves in {elapsed:.1f} seconds "
+              f"({self.n_games / elapsed:.2f} games/s, {n_moves / elapsed:.1f} moves/s)")
+        print(f"Black Player won {winners.count(1)} games || White Player won {winners.count(2)} games\n")
+        return winners
+
+    def leaf_board(self, leaf) -> np.ndarray:
+        """
+        @return   The board of a leaf, from its bitboards.
+        """
+        n_nodes = self.board_size ** 2
+        n_bytes = (n_nodes + 7) // 8
+        black = np.unpackbits(np.frombuffer(leaf.black.to_bytes(n_bytes, "little"), dtype=np.uint8), bitorder="little")
+        white = np.unpackbits(np.frombuffer(leaf.white.to_bytes(n_bytes, "little"), dtype=np.uint8), bitorder="little")
+        return (black[:n_nodes] + 2 * white[:n_nodes]).astype(np.int8).reshape(self.board_size, self.board_size)
@@ -0,0 +1,154 @@
+import argparse
+import sys
+from typing import Optional
+
+import numpy as np
+
+from classes.bitboard import Bitboard
+from classes.hashing import board_key
+
+# Largest board solved in a reasonable time. The default 5x5 board is out of reach: a 4x4 board is solved
+# in under a second (about 40,000 positions), but a 5x5 one is not after minutes and gigabytes of positions,
+# even when positions equal by rotation share their entry and positions that one player can no longer win are cut.
+# Solving it would take virtual connections (e.g., H-search), to reduce the moves searched to those of the carriers.
+MAX_SOLVED_SIZE = 4
+
+
+class Solver(Bitboard):
+    def __init__(self, board_size: int):
+        """
+        Exact solver of small boards, on bitboards (see Bitboard).
+        """
+        super().__init__(board_size)
+        n = board_size
+
+        # Centre first: winning moves are found sooner, so that less of the tree is searched
+        centre = (n - 1) / 2
+        self.order = sorted(range(n * n), key=lambda node: abs(node // n - centre) + abs(node % n - centre))
+
+        # Solved positions: (black, white, player to move) -> (wins, move)
+        self.table = {}
+
+    def solve(self, black: int, white: int, player: int, exhaustive: bool = False) -> tuple:
+        """
+        Solves the position where it is the turn of "player", none of the players having won yet.
+
+        Unless "exhaustive", the search stops at the first winning move, so that only the positions of a proof
+        are solved; otherwise, every position reachable from the given one is solved.
+
+        @return   (wins, move), i.e., whether the player to move wins, and a winning move (any move if he loses).
+        """
+        key = (black, white, player)
+        if key in self.table:
+            return self.table[key]
+
+        n = self.board_size
+        stones = { 1: black, 2: white }
+        other = 3 - player
+        free = self.full & ~(black | white)
+        moves = [ node for node in self.order if free >> node & 1 ]
+
+        if not exhaustive:
+            # Winning in one move
+            for node in moves:
+                if self.connects(stones[player] | 1 << node, player):
+                    result = (True, (node // n, node % n))
+                    self.table[key] = result
+                    return result
+
+            # Forced replies: should the opponent win in one move, this move must be prevented
+            threats = [ node for node in moves if self.connects(stones[other] | 1 << node, other) ]
+            if len(threats) > 1:
+                result = (False, (threats[0] // n, threats[0] % n))
+                self.table[key] = result
+                return result
+            if threats:
+                moves = threats
+
+        result = None
+        for node in moves:
+            bit = 1 << node
+            if player == 1:
+                wins = self.connects(black | bit, 1) or not self.solve(black | bit, white, 2, exhaustive)[0]
+            else:
+                wins = self.connects(white | bit, 2) or not self.solve(black, white | bit, 1, exhaustive)[0]
+
+            if result is None or wins and not result[0]:
+                result = (wins, (node // n, node % n))
+                if wins and not exhaustive:
+                    break
+
+        self.table[key] = result
+        return result
+
+    def solve_board(self, board: np.ndarray, player: int) -> tuple:
+        """
+        @return   (wins, move) for the player to move on the given board (see solve).
+        """
+        black, white = self.from_board(board)
+        return self.solve(black, white, player)
+
+    def keys_and_values(self) -> tuple:
+        """
+        @return   The solved positions as two arrays sorted by key, i.e., the keys (see board_key) and the values,
+                  i.e., +(node + 1) for a winning move on node and -(node + 1) for a losing one.
+        """
+        n = self.board_size
+        keys, values = [], []
+        for (black, white, player), (wins, (x, y)) in self.table.items():
+            board = np.array([ 1 if black >> node & 1 else 2 if white >> node & 1 else 0 for node in range(n * n) ],
+                             dtype=np.int8).reshape(n, n)
+            keys.append(board_key(board, player))
+            values.append((x * n + y + 1) * (1 if wins else -1))
+
+        keys = np.array(keys, dtype=np.int64)
+        order = np.argsort(keys)
+        return keys[order], np.array(values, dtype=np.int8)[order]
+
+    def save(self, path: str) -> None:
+        keys, values = self.keys_and_values()
+        np.savez_compressed(path, board_size=self.board_size, keys=keys, values=values)
+
+
+class SolvedTable:
+    def __init__(self, path: str):
+        """
+        Loads a table written by Solver.save, to be queried with one binary search per position.
+        """
+        data = np.load(path)
+        self.board_size = int(data["board_size"])
+        self.keys = data["keys"]
+        self.values = data["values"]
+
+    def lookup(self, board: np.ndarray, player: int) -> Optional[tuple]:
+        """
+        @return   (wins, move) for the player to move, or None if the position is not in the table.
+        """
+        if len(board) != self.board_size:
+            return None
+
+        key = board_key(board, player)
+        index = np.searchsorted(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            return None
+
+        value = int(self.values[index])
+        node = abs(value) - 1
+        return (value > 0, (node // self.board_size, node % self.board_size))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solves every position reachable on a small board.")
+    parser.add_argument("board_size", type=int, choices=range(2, MAX_SOLVED_SIZE + 1), metavar="board_size",
+                        help=f"size of the board, from 2 to {MAX_SOLVED_SIZE} (larger boards do not finish)")
+    parser.add_argument("-o", "--output", default=None, help="table to write (default: solved<board_size>.npz)")
+    parser.add_argument("--exhaustive", action="store_true",
+                        help="solve every reachable position rather than only those of a winning strategy")
+    options = parser.parse_args()
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * options.board_size ** 2))
+    solver = Solver(options.board_size)
+    for player in (1, 2):
+        solver.solve(0, 0, player, exhaustive=options.exhaustive)
+    solver.save(options.output or f"solved{options.board_size}.npz")
+    print(f"{len(solver.table)} positions solved")
@@ -0,0 +1,98 @@
+from math import inf, log, log10, sqrt
+from typing import Optional
+
+
+def elo_to_score(elo: float) -> float:
+    """
+    @return   The expected score of a player that is "elo" points stronger than its opponent.
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score: float) -> float:
+    """
+    @return   The Elo difference matching an expected score.
+    """
+    if score <= 0:
+        return -inf
+    if score >= 1:
+        return inf
+    return -400 * log10(1 / score - 1)
+
+
+def elo_estimate(wins: int, losses: int, z: float = 1.96) -> tuple:
+    """
+    @return   The Elo difference estimated from the results, with the bounds of its confidence interval
+              (95% by default), i.e., (elo, low, high).
+
+    Games of Hex cannot be drawn, so the score follows a binomial law, whose interval is the Wilson score interval
+    (it remains meaningful when one player won every game).
+    """
+    games = wins + losses
+    if games == 0:
+        return (0.0, -inf, inf)
+
+    score = wins / games
+    center = (score + z ** 2 / (2 * games)) / (1 + z ** 2 / games)
+    margin = z / (1 + z ** 2 / games) * sqrt(score * (1 - score) / games + z ** 2 / (4 * games ** 2))
+    return (score_to_elo(score), score_to_elo(center - margin), score_to_elo(center + margin))
+
+
+class SPRT:
+    # Outcomes of the test
+    H0, H1 = "H0", "H1"
+
+    def __init__(self, elo0: float = 0, elo1: float = 10, alpha: float = 0.05, beta: float = 0.05):
+        """
+        Sequential probability ratio test of the hypothesis H1 (the candidate is "elo1" points stronger)
+        against H0 (the candidate is "elo0" points stronger), with:
+           * alpha, the probability of accepting H1 when H0 is true,
+           * beta, the probability of accepting H0 when H1 is true.
+
+        Raises a ValueError unless elo0 < elo1 and both probabilities are strictly between 0 and 1.
+        """
+        if not elo0 < elo1:
+            raise ValueError(f"elo0 ({elo0}) must be lower than elo1 ({elo1})")
+        for name, value in (("alpha", alpha), ("beta", beta)):
+            if not 0 < value < 1:
+                raise ValueError(f"{name} ({value}) must be strictly between 0 and 1")
+        self.elo0, self.elo1 = elo0, elo1
+        self.alpha, self.beta = alpha, beta
+
+        self.lower = log(beta / (1 - alpha))
+        self.upper = log((1 - beta) / alpha)
+
+        p0, p1 = elo_to_score(elo0), elo_to_score(elo1)
+        self.win_llr = log(p1 / p0)
+        self.loss_llr = log((1 - p1) / (1 - p0))
+
+        self.wins, self.losses = 0, 0
+
+    def record(self, won: bool) -> Optional[str]:
+        """
+        Adds the result of a game of the candidate.
+
+        @return   The accepted hypothesis, i.e., either H0 or H1, or None while the test goes on.
+        """
+        if won:
+            self.wins += 1
+        else:
+            self.losses += 1
+        return self.status()
+
+    def llr(self) -> float:
+        """
+        @return   The log-likelihood ratio of H1 against H0 given the results so far.
+        """
+        return self.wins * self.win_llr + self.losses * self.loss_llr
+
+    def status(self) -> Optional[str]:
+        llr = self.llr()
+        if llr >= self.upper:
+            return self.H1
+        if llr <= self.lower:
+            return self.H0
+        return None
+
+    def elo(self) -> tuple:
+        return elo_estimate(self.wins, self.losses)
@@ -1,26 +1,86 @@
 import copy
-from math import log, sqrt, inf, floor
+import logging
 from random import choice
-from typing import List, Optional
+from typing import Optional
 
 import numpy as np
-from rich.console import Console
-from rich.progress import track
-from rich.table import Table
 
-from classes.utils import index_finder, all_equal
+from classes import kernels
+from classes.hashing import canonical_key, params_key, ZOBRIST_PLAYER, ZOBRIST_SIZE
+from classes.registry import resolve
+from classes.transposition import EXACT, LOWER, UPPER
 
 import time
 
 play_move_time = {1 : [], 2 : []}
 
+# Solved-position tables already loaded, by path, and live solvers, by board size
+solved_tables = {}
+solvers = {}
+# Solved-position tables whose missing positions were searched rather than solved, already logged
+fallbacks = set()
+
+# Monte-Carlo tree searches, by board size and capacity (reset between moves rather than reallocated)
+searchers = {}
+
+# Transposition table shared by the alpha-beta searches of every process (see classes/transposition.py), if any
+shared_table = None
+
+# Search results kept from one run to the next (see classes/cache.py), if any
+position_cache = None
+
+# Function called with the player, the time taken and the number of search nodes after each move of an AI player,
+# e.g., to update live metrics (see classes/metrics.py), if any
+move_observer = None
+
+# Bounds of the scores of the negamax search, and score of a win at the root (see STRAT.terminal_score),
+# within the 16 bits of a value of the transposition table
+INFINITY = 0x7FFF
+WIN_SCORE = 0x4000
+
+
+def use_transposition_table(table) -> None:
+    global shared_table
+    shared_table = table
+
+
+def use_position_cache(cache) -> None:
+    global position_cache
+    position_cache = cache
+
+
+def use_move_observer(observer) -> None:
+    global move_observer
+    move_observer = observer
+
+
+def to_table(value: int, ply: int, n_nodes: int) -> int:
+    """
+    @return   The score of a won or lost position (see STRAT.terminal_score) as if the node were the root,
+              so that a stored score does not depend on the ply where it is probed.
+    """
+    if abs(value) <= 1:
+        return value
+    return value + n_nodes * ply if value > 0 else value - n_nodes * ply
+
+
+def from_table(value: int, ply: int, n_nodes: int) -> int:
+    if abs(value) <= 1:
+        return value
+    return value - n_nodes * ply if value > 0 else value + n_nodes * ply
+
+
 class Node(object):
-    def __init__(self, logic, board, move=(None, None), wins=0, visits=0, children=None):
-        # Save the #wins:#visited ratio
+    __slots__ = ("state", "move", "children", "parent", "untried_moves")
+
+    # Number of nodes created by all the searches so far (see classes/metrics.py),
+    # where each iteration of an MCTS search counts as one node (see STRAT.mcts_strategy)
+    count = 0
+
+    def __init__(self, logic, board, move=(None, None), children=None):
+        Node.count += 1
         self.state = board
         self.move = move
-        self.wins = wins
-        self.visits = visits
         self.children = children or []
         self.parent = None
         self.untried_moves = logic.get_possible_moves(board)
@@ -45,25 +105,27 @@ class Node(object):
         self.children.append(child)
 
 
-    def create_children(self, logic, player: int, moves_heuritic: bool = False):
-        if moves_heuritic:
-            for x, y in self.get_moves_to_explore(logic, player):
-                new_state = np.copy(self.state)
-                new_state[x][y] = player
-                new_node = Node(logic, board=new_state, move=(x, y))
-                self.add_child(new_node)
-        else:
-            for x, y in self.untried_moves:
-                new_state = np.copy(self.state)
-                new_state[x][y] = player
-                new_node = Node(logic, board=new_state, move=(x, y))
-                self.add_child(new_node)
+    def create_children(self, logic, player: int, moves_heuritic: bool = False, priors=None):
+        moves = self.get_moves_to_explore(logic, player) if moves_heuritic else self.untried_moves
+
+        # Best candidates first (better cut-offs), and the worst ones pruned
+        if priors is not None:
+            moves = priors.rank(self.state, moves, player)
+
+        for x, y in moves:
+            new_state = np.copy(self.state)
+            new_state[x][y] = player
+            new_node = Node(logic, board=new_state, move=(x, y))
+            self.add_child(new_node)
         
     ##################################################
     #        HEURISTICS ABOUT MOVE EXPLORATION       #
     ##################################################
 
     def get_moves_to_explore(self, logic, player: int):
+        if kernels.active:
+            return kernels.explored_moves(self.state, player)
+
         board = np.copy(self.state)
         
         moves_of_player, moves_of_other_player = [], []
@@ -120,7 +182,14 @@ class Node(object):
 
 
 class STRAT:
-    def __init__(self, logic, ui, board_state, starting_player):
+    # Engine (see classes/registry.py) played by each player when none is given
+    DEFAULT_STRATEGIES = { 1: "random",
+                           2: "minimaxAB_bestChoice" }
+
+    # Methods searching with Logic and Node, i.e., which run faster with the compiled kernels (see classes/kernels.py)
+    KERNEL_METHODS = { "minimax_strategy", "minimaxAB_strategy", "minimaxAB_bestChoice", "solved_strategy" }
+
+    def __init__(self, logic, ui, board_state, starting_player, strategy: Optional[str] = None, priors=None):
         self.logic = logic
         self.ui = ui
         self.root_state = copy.copy(board_state)
@@ -131,27 +200,25 @@ class STRAT:
         self.other_player = self.players[0]
         self.turn = {True: self.starting_player, False: self.other_player}
         self.turn_state = True
+        self.strategy = strategy or self.DEFAULT_STRATEGIES[self.starting_player]
+        self.method, self.params = resolve(self.strategy)
+        self.moves_heuristic = False
+        # Optional PatternScorer ranking and pruning the moves to explore
+        self.priors = priors
 
     def start(self) -> tuple:
+        n_nodes = Node.count
         root_node = Node(self.logic, self.root_state)
     
         start_time = time.time()
-        if self.starting_player is self.ui.BLACK_PLAYER:
-            # implement here Black player strategy (if needed, i.e., no human playing)
-            x, y = self.random_strategy(root_node)
-            #x, y = self.minimax_strategy(root_node)
-            #x, y = self.minimaxAB_strategy(root_node)
-
-        elif self.starting_player is self.ui.WHITE_PLAYER:
-            # implement here White player strategy
-            # x, y = self.minimax_strategy(root_node)
-            #x, y = self.minimaxAB_strategy(root_node)
-            x, y = self.minimaxAB_bestChoice(root_node)
+        x, y = getattr(self, self.method)(root_node, **self.params)
         
         #print(f"move played : ({x}, {y})\n")
         
         time_elapsed = time.time() - start_time
         play_move_time[self.starting_player].append(time_elapsed)
+        if move_observer is not None:
+            move_observer(self.starting_player, time_elapsed, Node.count - n_nodes)
         
         return (x, y)
 
@@ -162,6 +229,74 @@ class STRAT:
     def random_strategy(self, node: Node) -> tuple:
         return choice(node.untried_moves)
 
+    ##################################################
+    #                SOLVED POSITIONS                #
+    ##################################################
+
+    def solved_strategy(self, root: Node, table: str = "", depth: int = 4, live_size: int = 4) -> tuple:
+        """
+        Plays the move of the solved-position table (see classes/solver.py) with a single lookup.
+        Positions that are not in the table are solved on the fly on boards up to "live_size" (at most MAX_SOLVED_SIZE,
+        i.e., 4x4, see classes/solver.py), and searched by minimaxAB_bestChoice on larger boards, including
+        the default 5x5 board, which is then no longer perfect play: this is logged.
+
+        By default, the table of a board of size n is "solved<n>.npz".
+        """
+        from classes.solver import MAX_SOLVED_SIZE, Solver, SolvedTable
+
+        path = table or f"solved{len(self.root_state)}.npz"
+        if path not in solved_tables:
+            try:
+                solved_tables[path] = SolvedTable(path)
+            except FileNotFoundError:
+                solved_tables[path] = None
+
+        solved = solved_tables[path] and solved_tables[path].lookup(self.root_state, self.starting_player)
+        if solved:
+            return solved[1]
+
+        board_size = len(self.root_state)
+        if board_size <= min(live_size, MAX_SOLVED_SIZE):
+            if board_size not in solvers:
+                solvers[board_size] = Solver(board_size)
+            return solvers[board_size].solve_board(self.root_state, self.starting_player)[1]
+
+        if path not in fallbacks:
+            fallbacks.add(path)
+            logging.warning(f"solved: no solved position of {path} for {board_size}x{board_size} boards, "
+                            f"playing minimaxAB_bestChoice (depth {depth}) instead of perfect play")
+        else:
+            logging.debug(f"solved: position not in {path}, playing minimaxAB_bestChoice")
+        return self.minimaxAB_bestChoice(root, depth=depth)
+
+    ##################################################
+    #            MONTE-CARLO TREE SEARCH             #
+    ##################################################
+
+    def mcts_strategy(self, root: Node, iterations: int = 1000, exploration: float = 1.4, capacity: int = 100000,
+                      playout: str = "random") -> tuple:
+        """
+        Runs "iterations" rounds of UCT (see classes/mcts.py) on a tree store of at most "capacity" nodes,
+        and plays the most visited move.
+
+        Playouts are either "random" or "bridge", i.e., saving two-bridges, and with pattern replies given priors.
+        """
+        from classes.mcts import MCTS
+
+        board_size = len(self.root_state)
+        if (board_size, capacity) not in searchers:
+            searchers[(board_size, capacity)] = MCTS(board_size, capacity)
+        searcher = searchers[(board_size, capacity)]
+        searcher.exploration = exploration
+        searcher.playout = playout
+        searcher.patterns = self.priors
+
+        searcher.reset(self.root_state, self.starting_player)
+        searcher.search(iterations)
+        # One tree node is visited per round
+        Node.count += iterations
+        return searcher.best_move()
+
     ##################################################
     #             HEURISTICS FUNCTIONS               #
     ##################################################
@@ -185,236 +320,178 @@ class STRAT:
         return choice(list(top_part.union(bottom_part)))
 
 
-    def get_score(self, board: np.array, player: int, argc: int) -> tuple:
-        path = self.logic.is_game_over(player, board)
-        if path is not None:
-            self.logic.GAME_OVER = False
-            if path["player"] is player:
-                if argc == 1:
-                    return 1 if player is self.ui.BLACK_PLAYER else -1
-                return (1, len(path["nodes"])) if player is self.ui.BLACK_PLAYER else (-1, len(path["nodes"]))
-
-        other_player = self.ui.BLACK_PLAYER if player is self.ui.WHITE_PLAYER else self.ui.WHITE_PLAYER
-        path = self.logic.is_game_over(other_player, board)
-        if path is not None:
-            self.logic.GAME_OVER = False
-            if path["player"] is other_player:
-                if argc == 1:
-                    return -1 if player is self.ui.BLACK_PLAYER else 1
-                return (-1, len(path["nodes"])) if player is self.ui.BLACK_PLAYER else (1, len(path["nodes"]))
-
-        return None
-
-
-    def choose_best_move(self, current_node: Node, minimax_values, path_lengths, depths) -> tuple:
-        best_path_length = min(path_lengths)
-        best_depth = max(depths)
-
-        """Summary of variables used below
-
-        path_indexes    : Get indexes in path_lengths which correspond to best_path_length
-        depth_indexes   : Get indexes in depths which correspond to best_depth
-        minimax_indexes : Get indexes in minimax_values which correspond to the best_value, i.e min or max
-
-        inter_depth_path    : Determine the intersection between path's and depth's indexes
-        inter_minimax_path  : Determine the intersection between minimax's and path's indexes
-        inter_minimax_depth : Determine the intersection between minimax's and depth's indexes
-        inter_of_inters     : Determine the intersection between inter_minimax_path and inter_minimax_depth
+    def terminal_score(self, board: np.ndarray, player: int, ply: int) -> Optional[int]:
         """
+        @return   The score of the position for the player who just moved, if he has won, or else None.
 
-        if all_equal(minimax_values):
-            path_indexes = index_finder(path_lengths, best_path_length)
-            if all_equal(depths):
-                # Pick a move which minimize the path length
-                return current_node.children[choice(path_indexes)].move
-            else:
-                depth_indexes = index_finder(depths, best_depth)
-                inter_depth_path = list(set(depth_indexes) & set(path_indexes))
-                # print(f"depth_indexes : {depth_indexes} ; path_indexes : {path_indexes} ; inter : {inter_depth_path}")
-
-                # If the intersection isn't empty then return one of these indexes
-                # else return one of the path_indexes
-                return current_node.children[choice(inter_depth_path)].move if len(inter_depth_path) > 0 else current_node.children[choice(path_indexes)].move
-
-        else:
-            best_value = max(minimax_values) if self.starting_player is self.ui.BLACK_PLAYER else min(minimax_values)
-
-            minimax_indexes = index_finder(minimax_values, best_value)
-            path_indexes = index_finder(path_lengths, best_path_length)
-            depth_indexes = index_finder(depths, best_depth)
-
-            inter_minimax_path = list(set(minimax_indexes) & set(path_indexes))
-            inter_minimax_depth = list(set(minimax_indexes) & set(depth_indexes))
-            # print(f"depth_indexes : {depth_indexes} ; path_indexes : {path_indexes} ; inter : {inter_minimax_path} ; inter2 : {inter_minimax_depth}")
-            inter_of_inters = list(set(inter_minimax_path) & set(inter_minimax_depth))
-
-            if len(inter_of_inters) > 0:
-                return current_node.children[choice(inter_of_inters)].move
-            elif len(inter_minimax_depth) > 0:
-                return current_node.children[choice(inter_minimax_depth)].move
-            elif len(inter_minimax_path) > 0:
-                return current_node.children[choice(inter_minimax_path)].move
-            return current_node.children[choice(minimax_indexes)].move
+        Earlier wins (in plies from the root) score more, and then wins along shorter paths: each ply weighs more
+        than the longest path, i.e., the whole board, so that a single integer orders both tie-breaks,
+        and any win scores more than the leaves at depth 0.
+        """
+        path = self.logic.is_game_over(player, board)
+        if path is None:
+            return None
+        self.logic.GAME_OVER = False
+        n_nodes = len(self.root_state) ** 2
+        return WIN_SCORE - n_nodes * ply - len(path["nodes"])
 
     ##################################################
-    #                    MINIMAX                     #
+    #      NEGAMAX PRINCIPAL-VARIATION SEARCH        #
     ##################################################
 
-    def minimax_aux(self, current_node: Node, player: int, depth: int) -> int:
-        score = self.get_score(current_node.state, player, argc=1)
-        if score is not None:
-            return score
-
-        if depth == 0:
-            if player is self.starting_player:
-                return 1 if player is self.ui.BLACK_PLAYER else -1
-            return -1 if player is self.ui.BLACK_PLAYER else 1
-
-        current_node.create_children(self.logic, player)
-
-        if player is self.ui.BLACK_PLAYER:
-            value = -inf
-            for child in current_node.children:
-                value = max(value, self.minimax_aux(child, self.ui.WHITE_PLAYER, depth - 1))
-        else:
-            value = inf
-            for child in current_node.children:
-                value = min(value, self.minimax_aux(child, self.ui.BLACK_PLAYER, depth - 1))
-
-        return value
-
-
-    def minimax_strategy(self, root: Node, depth: int = 4) -> tuple:
-        root.create_children(self.logic, self.starting_player)
-
-        minimax_values = []
-        for child in root.children:
-            minimax_values.append(self.minimax_aux(child, self.other_player, depth))
-
-        if all_equal(minimax_values):
-            best_move = choice(root.children).move
-        else:
-            best_value = max(minimax_values) if self.starting_player is self.ui.BLACK_PLAYER else min(minimax_values)
-            best_move = root.children[choice(index_finder(minimax_values, best_value))].move
-        
-        return best_move
+    def negamax(self, current_node: Node, player: int, alpha: int, beta: int, depth: int) -> int:
+        """
+        Alpha-beta search in negamax form, where every child but the first one is only searched with a null window,
+        i.e., proven no better than the best one so far, and searched again with the full window when it is.
 
-    ##################################################
-    #               MINIMAX ALPHA BETA               #
-    ##################################################
+        Leaves at depth 0 are valued in favour of the player who started the search (1 or -1).
 
-    def minimaxAB_aux(self, current_node: Node, player: int, alpha: int, beta: int, depth: int) -> int:
-        score = self.get_score(current_node.state, player, argc=1)
+        @return   The score of the node for "player", i.e., the player to move.
+        """
+        ply = self.search_depth - depth + 1
+        score = self.terminal_score(current_node.state, 3 - player, ply)
         if score is not None:
-            return score
+            return -score
 
         if depth == 0:
-            if player is self.starting_player:
-                return 1 if player is self.ui.BLACK_PLAYER else -1
-            return -1 if player is self.ui.BLACK_PLAYER else 1
-        
-        current_node.create_children(self.logic, player)
-
-        if player is self.ui.BLACK_PLAYER:
-            value = -inf
-            for child in current_node.children:
-                value = max(value, self.minimaxAB_aux(child, self.ui.WHITE_PLAYER, alpha, beta, depth - 1))
-                alpha = max(alpha, value)
+            return 1 if player == self.starting_player else -1
+
+        key, entry, rotated = None, None, False
+        if shared_table is not None or position_cache is not None:
+            key, rotated = self.table_key(current_node.state, player)
+            entry = self.probe(key)
+            if entry is not None and entry.depth >= depth:
+                value = from_table(entry.value, ply, len(self.root_state) ** 2)
+                if entry.bound == EXACT:
+                    return value
+                if entry.bound == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
                 if beta <= alpha:
-                    break
-        else:
-            value = inf
-            for child in current_node.children:
-                value = min(value, self.minimaxAB_aux(child, self.ui.BLACK_PLAYER, alpha, beta, depth - 1))
-                beta = min(beta, value)
-                if beta <= alpha:
-                    break
+                    return value
+        window = (alpha, beta)
 
-        return value
+        current_node.create_children(self.logic, player, moves_heuritic=self.moves_heuristic, priors=self.priors)
 
+        # Best move of a previous search first, stored for the rotated position if its key is that of the rotation
+        n_nodes = len(self.root_state) ** 2
+        if entry is not None and entry.move is not None:
+            move = n_nodes - 1 - entry.move if rotated else entry.move
+            current_node.children.sort(key=lambda child: child.move[0] * len(self.root_state) + child.move[1] != move)
 
-    def minimaxAB_strategy(self, root: Node, alpha: int = -2, beta: int = 2, depth: int = 4) -> tuple:
-        root.create_children(self.logic, self.starting_player)
+        value, best_move = -INFINITY, None
+        for child in current_node.children:
+            if best_move is None:
+                score = -self.negamax(child, 3 - player, -beta, -alpha, depth - 1)
+            else:
+                score = -self.negamax(child, 3 - player, -alpha - 1, -alpha, depth - 1)
+                if alpha < score < beta:
+                    score = -self.negamax(child, 3 - player, -beta, -score, depth - 1)
+            if score > value or best_move is None:
+                value, best_move = score, child.move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if key is not None and best_move is not None:
+            bound = UPPER if value <= window[0] else LOWER if value >= window[1] else EXACT
+            move = best_move[0] * len(self.root_state) + best_move[1]
+            self.store(key, to_table(value, ply, n_nodes), depth, bound, n_nodes - 1 - move if rotated else move)
 
-        minimax_values = []
-        for child in root.children:
-            value = self.minimaxAB_aux(child, self.other_player, alpha, beta, depth)
-            #print(f"val : {value} ; move : {child.move}")
-            minimax_values.append(value)
-        
-        if all_equal(minimax_values):
-            best_move = choice(root.children).move
+        return value
 
-        else:
-            best_value = max(minimax_values) if self.starting_player is self.ui.BLACK_PLAYER else min(minimax_values)
-            best_move = root.children[choice(index_finder(minimax_values, best_value))].move
+    def table_key(self, board: np.ndarray, player: int) -> tuple:
+        """
+        @return   The key of a position in the transposition table, and whether it is the key of its 180° rotation
+                  (see canonical_key), so that both positions share their entry.
 
-        return best_move
+        Since leaves are valued in favour of the player who started the search, so are stored values:
+        the key also depends on this player, and on the moves searched at each node (see negamax_root),
+        so that searches of other engines sharing the table do not cut off on bounds of a narrower or wider tree.
+        """
+        key, rotated = canonical_key(board, player)
+        key ^= self.search_key
+        return (key ^ int(ZOBRIST_PLAYER[0]) if self.starting_player == 2 else key), rotated
 
-    ##################################################
-    #          MINIMAX ALPHA BETA OPTIMIZED          #
-    ##################################################
+    def cache_key(self, key: int) -> int:
+        """
+        @return   The key of a position in the position cache, i.e., its key in the transposition table,
+                  which depends on the configuration of the engine (see table_key), and the size of the board,
+                  since the cache outlives the run.
+        """
+        return key ^ int(ZOBRIST_SIZE[len(self.root_state)])
 
-    def minimaxAB_bestChoice_aux(self, current_node: Node, player: int, alpha: int, beta: int, depth: int) -> tuple:
-        score = self.get_score(current_node.state, player, argc=2)
-        if score is not None:
-            score_minimax, path_length = score
-            return (score_minimax, path_length, depth)
+    def probe(self, key: int):
+        """
+        @return   The entry of the position in the transposition table or, failing that, in the position cache.
+        """
+        entry = shared_table.probe(key) if shared_table is not None else None
+        if entry is None and position_cache is not None:
+            entry = position_cache.probe(self.cache_key(key))
+        return entry
+
+    def store(self, key: int, value: int, depth: int, bound: int, move: int) -> None:
+        if shared_table is not None:
+            shared_table.store(key, value, depth, bound, move)
+        if position_cache is not None:
+            position_cache.store(self.cache_key(key), value, depth, bound, move)
+
+    def negamax_root(self, root: Node, depth: int, moves_heuristic: bool) -> tuple:
+        """
+        Searches every move of the root "depth" plies deep and plays one of the best ones, chosen at random.
 
-        if depth == 0:
-            if player is self.starting_player:
-                return (1, inf, -inf) if player is self.ui.BLACK_PLAYER else (-1, inf, -inf)
-            return (-1, inf, -inf) if player is self.ui.BLACK_PLAYER else (1, inf, -inf)
+        After the first move, a window around the best score only tells whether a move is worse, as good or better;
+        those that are better get their exact score from a second search.
 
-        current_node.create_children(self.logic, player, moves_heuritic=True)
+        On a position that the 180° rotation leaves unchanged, e.g., the empty board, a move and its rotation
+        are equivalent: only one of them is searched, and either is played.
+        """
+        self.moves_heuristic = moves_heuristic
+        self.search_depth = depth
+        # Configuration of the engine deciding the moves searched at each node (the depth of an entry is stored with it)
+        self.search_key = params_key(moves_heuristic, self.priors and self.priors.digest)
+        player = int(self.starting_player)
+        root.create_children(self.logic, player, moves_heuritic=self.moves_heuristic, priors=self.priors)
 
-        best_path_length, best_depth = inf, -inf
-        if player is self.ui.BLACK_PLAYER:
-            best_value_minimax  = -inf
-            for child in current_node.children:
-                value_minimax, path_length, depth_acc = self.minimaxAB_bestChoice_aux(child, self.ui.WHITE_PLAYER, alpha, beta, depth - 1)
-                # The mimimum path is the path which cross straight the board
-                # Therefore, the minimum size of the path is the board_size
-                if path_length >= len(self.root_state):
-                    best_path_length = min(path_length, best_path_length)
-
-                best_depth = max(depth_acc, best_depth)
-
-                best_value_minimax = max(value_minimax, best_value_minimax)
-                alpha = max(alpha, best_value_minimax)
-                if beta <= alpha:
-                    break
-        else:
-            best_value_minimax = inf
-            for child in current_node.children:
-                value_minimax, path_length, depth_acc = self.minimaxAB_bestChoice_aux(child, self.ui.BLACK_PLAYER, alpha, beta, depth - 1)
-                if path_length >= len(self.root_state):
-                    best_path_length = min(path_length, best_path_length)
+        board_size = len(self.root_state)
+        symmetric = np.array_equal(root.state, root.state[::-1, ::-1])
+        if symmetric:
+            moves = set()
+            for child in list(root.children):
+                x, y = child.move
+                if (board_size - 1 - x, board_size - 1 - y) in moves:
+                    root.children.remove(child)
+                moves.add((x, y))
+
+        best_value, best_moves = -INFINITY, []
+        for child in root.children:
+            if not best_moves:
+                value = -self.negamax(child, 3 - player, -INFINITY, INFINITY, depth)
+            else:
+                value = -self.negamax(child, 3 - player, -best_value - 1, -best_value + 1, depth)
+                if value > best_value:
+                    value = -self.negamax(child, 3 - player, -INFINITY, -best_value, depth)
 
-                best_depth = max(depth_acc, best_depth)
+            if value > best_value:
+                best_value, best_moves = value, [ child.move ]
+            elif value == best_value:
+                best_moves.append(child.move)
 
-                best_value_minimax = min(value_minimax, best_value_minimax)
-                beta = min(beta, best_value_minimax)
-                if beta <= alpha:
-                    break
+        if symmetric:
+            best_moves += [ (board_size - 1 - x, board_size - 1 - y) for x, y in best_moves
+                            if (x, y) != (board_size - 1 - x, board_size - 1 - y) ]
+        return choice(best_moves)
 
-        return (best_value_minimax, best_path_length, best_depth)
+    def minimax_strategy(self, root: Node, depth: int = 4, moves_heuristic: bool = False) -> tuple:
+        return self.negamax_root(root, depth, moves_heuristic)
 
+    def minimaxAB_strategy(self, root: Node, depth: int = 4, moves_heuristic: bool = False) -> tuple:
+        return self.negamax_root(root, depth, moves_heuristic)
 
-    def minimaxAB_bestChoice(self, root: Node, alpha: int = -2, beta: int = 2, depth: int = 4) -> tuple:
+    def minimaxAB_bestChoice(self, root: Node, depth: int = 4, moves_heuristic: bool = True) -> tuple:
         # Test if the board game is empty
         # i.e if the number of possible moves is equal to the dimension of the game
         if len(root.untried_moves) == len(self.root_state) ** 2:
             return self.first_move_choose(self.starting_player)
-
-        root.create_children(self.logic, self.starting_player, moves_heuritic=True)
-
-        minimax_values, path_lengths, depths = [], [], []
-        for child in root.children:
-            value, path_length, depth_acc = self.minimaxAB_bestChoice_aux(child, self.other_player, alpha, beta, depth=depth)
-            #print(f"val : {value} ; move : {child.move} ; path_length : {path_length} ; depth : {depth_acc}")
-            minimax_values.append(value)
-            path_lengths.append(path_length)
-            depths.append(depth_acc)
-        
-        return self.choose_best_move(root, minimax_values, path_lengths, depths)
\ No newline at end of file
+        return self.negamax_root(root, depth, moves_heuristic)
@@ -0,0 +1,128 @@
+from itertools import combinations
+from typing import Optional
+
+import pandas as pd
+
+from classes.registry import resolve
+from classes.tournament import init_worker, play_in_worker
+
+
+def with_depth(spec: str, depth: int) -> str:
+    """
+    @return   The engine described by "spec" (see classes/registry.py) searching "depth" plies deep,
+              or the engine itself if it has no depth.
+    """
+    _, params = resolve(spec)
+    if "depth" not in params:
+        return spec
+    return f"{spec}{',' if ':' in spec else ':'}depth={depth}"
+
+
+class Sweep:
+    def __init__(self, board_sizes: list, depths: list, engines: list, n_games: int, workers: int = 1,
+                 seed: Optional[int] = None, use_kernels: bool = True):
+        """
+        Parameter sweep: every pair of the given engines (see classes/registry.py) plays "n_games" games on each board
+        size, at each search depth (engines without a depth play once per board size).
+        As in a gauntlet, colours alternate every game, and the starting player every two games.
+
+        Games are spread over "workers" processes. Given a "seed", each game is seeded with it plus its number.
+        The searches use the compiled kernels of classes/kernels.py, when available, unless "use_kernels" is False.
+        """
+        assert len(engines) >= 2, "a sweep needs at least two engines"
+        self.board_sizes = board_sizes
+        self.depths = depths
+        self.engines = engines
+        self.n_games = n_games
+        self.workers = workers
+        self.seed = seed
+        self.use_kernels = use_kernels
+
+    def schedule(self) -> list:
+        """
+        @return   The games to play, i.e., (board size, depth, engine, opponent, player of the engine, game number,
+                  whether black starts, strategies), with one number per game, so that each game is seeded differently.
+        """
+        games = []
+        for board_size in self.board_sizes:
+            for engine, opponent in combinations(self.engines, 2):
+                cells = { (with_depth(engine, depth), with_depth(opponent, depth)): depth for depth in self.depths }
+                for (deep_engine, deep_opponent), depth in cells.items():
+                    if deep_engine == engine and deep_opponent == opponent:
+                        depth = None
+                    for _ in range(self.n_games):
+                        players = (deep_engine, deep_opponent) if _ % 2 == 0 else (deep_opponent, deep_engine)
+                        games.append((board_size, depth, engine, opponent, 1 if _ % 2 == 0 else 2, len(games),
+                                      _ // 2 % 2 == 0, { 1: players[0], 2: players[1] }))
+        return games
+
+    def run(self, output: Optional[str] = None) -> pd.DataFrame:
+        """
+        Plays all the games, and prints the results of each pair of engines on each board size and at each depth,
+        then the scaling curves of the time per move of each engine, and of the win rate of each pair.
+        The results are also written to the "output" CSV file, if any.
+
+        @return   The results, one row per board size, depth and pair of engines.
+        """
+        games = self.schedule()
+        settings = { "headless": True, "record": None, "patterns": None, "prior_width": None,
+                     "use_kernels": self.use_kernels }
+        tasks = [ ([ board_size, "ai_vs_ai", 0, self.n_games ], settings, self.seed, game_count, black_starts, strategies)
+                  for board_size, _, _, _, _, game_count, black_starts, strategies in games ]
+
+        if self.workers > 1:
+            from multiprocessing import Pool
+
+            with Pool(self.workers, initializer=init_worker, initargs=(None, 0)) as pool:
+                results = list(pool.imap(play_in_worker, tasks))
+        else:
+            results = [ play_in_worker(task) for task in tasks ]
+
+        # One row per game and engine, i.e., the engine of the pair or its opponent
+        rows = []
+        for (board_size, depth, engine, opponent, engine_player, *_), (winner, times, n_nodes, _) in zip(games, results):
+            for name, other, player in ((engine, opponent, engine_player), (opponent, engine, 3 - engine_player)):
+                rows.append({ "board_size": board_size, "depth": depth, "engine": name, "opponent": other,
+                              "pair": f"{engine} vs {opponent}", "first": player == engine_player,
+                              "win": winner == player, "seconds": sum(times[player]), "moves": len(times[player]),
+                              "nodes": n_nodes })
+        games = pd.DataFrame(rows)
+        games["depth"] = games["depth"].astype("Int64")
+
+        table = self.aggregate(games)
+        if output is not None:
+            table.to_csv(output, index=False)
+        with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", 200):
+            print("\nSweep results (win rate of the engine against its opponent):\n")
+            print(table.to_string(index=False))
+            print("\nTime per move (ms) by board size, for each engine and depth:\n")
+            print(self.latency_curves(games).to_string())
+            print("\nWin rate of the first engine of each pair by board size, for each depth:\n")
+            print(self.win_rate_curves(table).to_string())
+        return table
+
+    def aggregate(self, games: pd.DataFrame) -> pd.DataFrame:
+        """
+        @return   For each board size, depth and pair of engines: the number of games, the win rate of the engine,
+                  the time per move of both engines, and the search nodes per move.
+        """
+        keys = [ "board_size", "depth", "pair" ]
+        both = games.groupby(keys, dropna=False).agg(moves=("moves", "sum"), nodes=("nodes", "sum"))
+        first = games[games["first"]].groupby(keys, dropna=False)
+        second = games[~games["first"]].groupby(keys, dropna=False)
+
+        table = pd.DataFrame({ "games": first["win"].count(),
+                               "win_rate": 100 * first["win"].mean(),
+                               "engine_ms": 1000 * first["seconds"].sum() / first["moves"].sum().clip(lower=1),
+                               "opponent_ms": 1000 * second["seconds"].sum() / second["moves"].sum().clip(lower=1),
+                               # Both engines count the nodes of a game
+                               "nodes_per_move": both["nodes"] / 2 / both["moves"].clip(lower=1) })
+        return table.reset_index().round(2)
+
+    def latency_curves(self, games: pd.DataFrame) -> pd.DataFrame:
+        timing = games.groupby([ "board_size", "engine", "depth" ], dropna=False)[[ "seconds", "moves" ]].sum()
+        latency = 1000 * timing["seconds"] / timing["moves"].clip(lower=1)
+        return latency.unstack([ "engine", "depth" ]).round(2)
+
+    def win_rate_curves(self, table: pd.DataFrame) -> pd.DataFrame:
+        return table.set_index([ "board_size", "pair", "depth" ])["win_rate"].unstack([ "pair", "depth" ]).sort_index(axis=1)
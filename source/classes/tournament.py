@@ -1,37 +1,117 @@
 import os
-import pickle
 import logging
-from rich import print
-from rich.logging import RichHandler
+import random
+import threading
+from typing import Optional
 
-FORMAT = "%(message)s"
-logging.basicConfig(level="NOTSET", format=FORMAT, datefmt="[%X]", handlers=[RichHandler()])
+import numpy as np
+from rich import print
 
 # Hide Pygame welcome message
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
-import pygame
 
+from classes import kernels, strategy
+from classes.checkpoint import check_checkpoint, load_checkpoint, save_checkpoint
 from classes.game import Game
+from classes.records import game_record, save_record
+from classes.registry import resolve
+from classes.strategy import STRAT, Node, play_move_time, use_move_observer, use_position_cache, use_transposition_table
+from classes.utils import milliseconds_to_minutes_seconds
 
-import pandas as pd
 
-from classes.strategy import play_move_time
-from classes.utils import milliseconds_to_minutes_seconds
+def init_worker(table_name: Optional[str], table_size: int, cache: Optional[str] = None, moves=None) -> None:
+    """
+    Attaches a worker process to the transposition table of the tournament, if any,
+    and maps the position cache file, if any.
+    Each move is sent to the "moves" queue of the tournament, if any, as (player, seconds, nodes).
+    """
+    if table_name is not None:
+        from classes.transposition import SharedTranspositionTable
+        use_transposition_table(SharedTranspositionTable.attach(table_name, table_size))
+    if cache is not None:
+        from classes.cache import PositionCache
+        use_position_cache(PositionCache(cache))
+    if moves is not None:
+        use_move_observer(lambda *move: moves.put(move))
+
+
+def seed_game(seed: Optional[int], game_count: int) -> None:
+    """
+    Seeds the random generators for a game, so that the game is played the same whoever plays it, and whenever.
+    """
+    if seed is not None:
+        random.seed(seed + game_count)
+        np.random.seed((seed + game_count) % 2 ** 32)
+
+
+def play_in_worker(task: tuple) -> tuple:
+    """
+    Runs one game of a tournament in a worker process.
+
+    @return   The winner, the time taken by each player for each of his moves, the number of search nodes,
+              and the new entries of the position cache, if any.
+    """
+    args, settings, seed, game_count, black_starts, strategies = task
+    n_nodes = Node.count
+    for player in (1, 2):
+        del play_move_time[player][:]
+    seed_game(seed, game_count)
+
+    tournament = Tournament(args, **settings)
+    tournament.GAME_COUNT = game_count
+    tournament.strategies = strategies
+    winner = tournament.single_game(black_starts = black_starts)
+    entries = strategy.position_cache.drain() if strategy.position_cache is not None else {}
+    return winner, { player: list(play_move_time[player]) for player in (1, 2) }, Node.count - n_nodes, entries
+
 
 class Tournament:
-    def __init__(self, args:  list):
+    def __init__(self, args:  list, strategies: Optional[dict] = None, headless: bool = False,
+                 record: Optional[str] = None, patterns: Optional[str] = None, prior_width: Optional[int] = None,
+                 workers: int = 1, table_size: int = 0, seed: Optional[int] = None, metrics=None,
+                 cache: Optional[str] = None, use_kernels: bool = True):
         """
         Initialises a tournament with:
            * the size of the board,
            * the playing mode, i.e., "ai_vs_ai", "man_vs_ai",
            * the game counter,
            * the number of games to play.
+
+        Optionally, the strategy of each AI player can be given, e.g., {1: "random", 2: "minimaxAB_bestChoice"},
+        and the games can be run without any window (pygame is then never imported).
+        Finished games are appended to the "record" JSON-lines file, if any.
+        The AI players rank (and prune to "prior_width") their candidate moves with the "patterns" weight table, if any.
+
+        Games between AI players are spread over "workers" processes (then without any window), whose alpha-beta
+        searches share a transposition table of "table_size" buckets in shared memory (none if 0).
+        Given a "seed", each game is seeded with it plus its number, so that it can be replayed.
+        Moves and finished games are counted in "metrics" (see classes/metrics.py), if any.
+        The alpha-beta searches reuse (and add to) the results of previous runs kept in the "cache" file, if any.
+        They use the compiled kernels of classes/kernels.py, when available, unless "use_kernels" is False.
         """
         self.args = args
         self.BOARD_SIZE = args[0]
         self.MODE = args[1]
         self.GAME_COUNT = args[2]
         self.N_GAMES = args[3]
+        self.strategies = strategies
+        self.headless = (headless or workers > 1) and self.MODE == "ai_vs_ai"
+        self.record = record
+        self.workers = workers
+        self.table_size = table_size
+        self.seed = seed
+        self.metrics = metrics
+        self.cache = cache
+
+        # Settings to rebuild the tournament in a worker process
+        self.settings = { "headless": True, "record": record, "patterns": patterns, "prior_width": prior_width,
+                          "use_kernels": use_kernels }
+        kernels.use_kernels(use_kernels)
+
+        self.priors = None
+        if patterns is not None:
+            from classes.patterns import PatternScorer
+            self.priors = PatternScorer(patterns, width=prior_width)
 
     def single_game(self, black_starts: bool = True) -> int:
         """
@@ -40,10 +120,18 @@ class Tournament:
         @return   The number of the winner, either 1 or 2, for black and white respectively.
         """
 
-        pygame.init()
-        pygame.display.set_caption("Polyline")
+        if not self.headless:
+            import pygame
+            pygame.init()
+            pygame.display.set_caption("Polyline")
+
+        # Compile the kernels before the first timed move, unless no player needs them
+        strategies = { **STRAT.DEFAULT_STRATEGIES, **(self.strategies or {}) }
+        if any(resolve(spec)[0] in STRAT.KERNEL_METHODS for spec in strategies.values()):
+            kernels.warm_up()
 
-        game = Game(board_size = self.BOARD_SIZE, mode = self.MODE, black_starts = black_starts)
+        game = Game(board_size = self.BOARD_SIZE, mode = self.MODE, black_starts = black_starts,
+                    strategies = self.strategies, headless = self.headless, priors = self.priors)
         game.get_game_info([ self.BOARD_SIZE, self.MODE, self.GAME_COUNT ])
         
         while game.winner is None:
@@ -59,29 +147,130 @@ class Tournament:
             value = game.nb_turns
 
         print(f"Number of moves played by white : {value}") 
+
+        if self.record is not None:
+            strategies = { **STRAT.DEFAULT_STRATEGIES, **(self.strategies or {}) }
+            if self.MODE == "man_vs_ai":
+                strategies[1] = "human"
+            save_record(self.record, game_record(self.BOARD_SIZE, black_starts, game.logic.history, game.winner, strategies))
          
         return game.winner
 
-    def championship(self):
+    def play_games(self, schedule: list):
         """
-        Runs a number of games between the same two opponents.
+        Runs the games of the schedule, i.e., a list of (game count, whether black starts, strategies), either in turn,
+        or in worker processes when there is more than one worker.
+
+        @return   A generator of the winner of each game, in order, with the time taken by each player for each of his moves.
         """
-        for _ in range(self.N_GAMES):
-            self.GAME_COUNT = _
+        table = None
+        if self.table_size:
+            from classes.transposition import SharedTranspositionTable
+            table = SharedTranspositionTable(self.table_size)
+            use_transposition_table(table)
+
+        moves = None
+        cache = None
+        if self.cache is not None:
+            from classes.cache import PositionCache
+            cache = PositionCache(self.cache)
+            use_position_cache(cache)
 
-            # First half of the tournament started by one player.
-            # Remaining half started by other player (see "no pie rule")
-            winner = self.single_game(black_starts = self.GAME_COUNT < self.N_GAMES / 2)
+        try:
+            if self.workers > 1:
+                from multiprocessing import Pool, SimpleQueue
 
+                # Moves played by the workers, counted by a thread of this process as soon as they are played
+                if self.metrics is not None:
+                    moves = SimpleQueue()
+                    drainer = threading.Thread(target=self.metrics.drain, args=(moves,), daemon=True)
+                    drainer.start()
 
-        log = logging.getLogger("rich")
+                tasks = [ (self.args, self.settings, self.seed, game_count, black_starts, strategies)
+                          for game_count, black_starts, strategies in schedule ]
+                with Pool(self.workers, initializer=init_worker,
+                          initargs=(table and table.name, self.table_size, self.cache, moves)) as pool:
+                    for winner, times, n_nodes, entries in pool.imap(play_in_worker, tasks):
+                        if cache is not None:
+                            cache.update(entries)
+                        for player in (1, 2):
+                            play_move_time[player] += times[player]
+                        if self.metrics is not None:
+                            self.metrics.add_game(winner)
+                        yield winner, times
+            else:
+                if self.metrics is not None:
+                    use_move_observer(self.metrics.add_move)
+                for game_count, black_starts, strategies in schedule:
+                    self.GAME_COUNT = game_count
+                    self.strategies = strategies
+                    n_times = { player: len(play_move_time[player]) for player in (1, 2) }
+                    seed_game(self.seed, game_count)
+                    winner = self.single_game(black_starts = black_starts)
+                    times = { player: play_move_time[player][n_times[player]:] for player in (1, 2) }
+                    if self.metrics is not None:
+                        self.metrics.add_game(winner)
+                    yield winner, times
+        finally:
+            use_move_observer(None)
+            if moves is not None:
+                moves.put(None)
+                drainer.join(timeout=5)
+            if table is not None:
+                use_transposition_table(None)
+                table.close()
+                table.unlink()
+            if cache is not None:
+                use_position_cache(None)
+                size = cache.merge()
+                logging.info(f"{size} positions in the cache {self.cache}")
 
+    def championship(self, checkpoint: Optional[str] = None, checkpoint_every: int = 10):
+        """
+        Runs a number of games between the same two opponents.
+
+        With a "checkpoint" path, the results of the games played so far and the timing aggregates are written there
+        every "checkpoint_every" games (and when the championship is interrupted). Should this file already exist,
+        the championship resumes where it stopped, with the same seeds for the remaining games,
+        provided it is the same championship: otherwise, a ValueError names the field that differs.
+        """
         # creation of a dictionary to count the victories of each player
         win_count = {1 : 0, 2 : 0}
-        for _ in range(self.N_GAMES):
-            self.GAME_COUNT = _
+        # total time and number of moves of each player, restored from the checkpoint
+        move_time = {1 : [0.0, 0], 2 : [0.0, 0]}
+        # winner of each game already played
+        results = {}
 
-            winner = self.single_game(black_starts = self.GAME_COUNT < self.N_GAMES / 2)
+        state = load_checkpoint(checkpoint) if checkpoint is not None else None
+        if state is not None:
+            check_checkpoint(checkpoint, state, self.args, self.strategies_key())
+            self.seed = state["seed"]
+            results = { int(game_count): winner for game_count, winner in state["results"].items() }
+            move_time = { int(player): aggregate for player, aggregate in state["move_time"].items() }
+            print(f"Resuming from {checkpoint}: {len(results)} games already played")
+        elif checkpoint is not None and self.seed is None:
+            self.seed = random.randrange(2 ** 31)
+
+        def save():
+            if checkpoint is not None:
+                save_checkpoint(checkpoint, { "args": self.args, "strategies": self.strategies_key(), "seed": self.seed,
+                                              "results": results, "move_time": move_time })
+
+        # First half of the tournament started by one player.
+        # Remaining half started by other player (see "no pie rule")
+        schedule = [ (_, _ < self.N_GAMES / 2, self.strategies) for _ in range(self.N_GAMES) if _ not in results ]
+        try:
+            for (game_count, _, _), (winner, times) in zip(schedule, self.play_games(schedule)):
+                results[game_count] = winner
+                for player in (1, 2):
+                    move_time[player][0] += sum(times[player])
+                    move_time[player][1] += len(times[player])
+                if len(results) % checkpoint_every == 0:
+                    save()
+        finally:
+            save()
+
+        for winner in results.values():
             # The winner of each game is recorded by incrementing the corresponding value in the "win_count" dictionary.
             win_count[winner] += 1
 
@@ -89,11 +278,121 @@ class Tournament:
         print(f"Win rate Black player: {int((win_count[1]/self.N_GAMES)*100)}% || Win rate White player: {int((win_count[2]/self.N_GAMES)*100)}% \n")
 
         # Average time for each player to play a move
-        average_time_black_player = sum(play_move_time[1])/len(play_move_time) * 1000
+        average_time_black_player = move_time[1][0]/max(move_time[1][1], 1) * 1000
         minutes_black_player, seconds_black_player = milliseconds_to_minutes_seconds(average_time_black_player)
         
-        average_time_white_player = sum(play_move_time[2])/len(play_move_time) * 1000
+        average_time_white_player = move_time[2][0]/max(move_time[2][1], 1) * 1000
         minutes_white_player, seconds_white_player = milliseconds_to_minutes_seconds(average_time_white_player)
 
         print(f"Black player took an average of {average_time_black_player} milliseconds, i.e {minutes_black_player} minutes and {seconds_black_player} seconds to make a move during these games\n")
-        print(f"White player took an average of {average_time_white_player} milliseconds, i.e {minutes_white_player} minutes and {seconds_white_player} seconds to make a move during these games\n")
\ No newline at end of file
+        print(f"White player took an average of {average_time_white_player} milliseconds, i.e {minutes_white_player} minutes and {seconds_white_player} seconds to make a move during these games\n")
+
+    def strategies_key(self) -> dict:
+        """
+        @return   The strategy of each player, as stored in a checkpoint.
+        """
+        return { str(player): name for player, name in { **STRAT.DEFAULT_STRATEGIES, **(self.strategies or {}) }.items() }
+
+    def match(self, elo0: float = 0, elo1: float = 10, alpha: float = 0.05, beta: float = 0.05) -> Optional[str]:
+        """
+        Runs games between the BLACK strategy (the candidate) and the WHITE strategy (the reference) until a
+        sequential probability ratio test accepts or rejects that the candidate is "elo1" rather than "elo0"
+        points stronger, or until N_GAMES games are played.
+
+        Players take turns to start, so that the first-move advantage does not bias the test.
+
+        @return   The accepted hypothesis, i.e., either SPRT.H0 or SPRT.H1, or None if the test is inconclusive.
+        """
+        from classes.sprt import SPRT
+
+        sprt = SPRT(elo0, elo1, alpha, beta)
+        status = None
+        schedule = [ (_, _ % 2 == 0, self.strategies) for _ in range(self.N_GAMES) ]
+        for winner, _ in self.play_games(schedule):
+            status = sprt.record(winner == 1)
+            if status is not None:
+                break
+
+        elo, low, high = sprt.elo()
+        games = sprt.wins + sprt.losses
+        print(f"\nCandidate (black) won {sprt.wins} games || Reference (white) won {sprt.losses} games, out of {games} games")
+        print(f"LLR: {sprt.llr():.3f} (bounds {sprt.lower:.3f} and {sprt.upper:.3f}) for H0: elo = {elo0} vs H1: elo = {elo1}")
+        print(f"Elo difference: {elo:.1f} (95% confidence interval from {low:.1f} to {high:.1f})")
+
+        if   status == SPRT.H1:    print("H1 accepted: the candidate is stronger.\n")
+        elif status == SPRT.H0:    print("H0 accepted: the candidate is not stronger.\n")
+        else:                      print(f"Inconclusive after {games} games.\n")
+
+        return status
+
+
+    def gauntlet(self, engines: list) -> dict:
+        """
+        Runs a round-robin tournament between the given engines (see classes/registry.py): every pair of engines plays
+        N_GAMES games, each engine playing either colour and starting in turn.
+
+        Prints a cross-table of the win rates and of the average time per move of each engine.
+
+        @return   The number of wins of each engine against each other engine, i.e., wins[engine][opponent].
+        """
+        from itertools import combinations
+
+        # The same engine twice would share its row of the cross-table
+        if len(set(engines)) < len(engines):
+            logging.warning("gauntlet: duplicate engines are only played once")
+            engines = list(dict.fromkeys(engines))
+
+        wins = { engine: { opponent: 0 for opponent in engines } for engine in engines }
+        move_times = { engine: [] for engine in engines }
+
+        # Colours alternate every game, the starting player every two games
+        schedule = [ (_, _ // 2 % 2 == 0, { 1: players[0], 2: players[1] })
+                     for engine, opponent in combinations(engines, 2)
+                     for _ in range(self.N_GAMES)
+                     for players in [ (engine, opponent) if _ % 2 == 0 else (opponent, engine) ] ]
+
+        for (_, _, strategies), (winner, times) in zip(schedule, self.play_games(schedule)):
+            wins[strategies[winner]][strategies[3 - winner]] += 1
+            for player in (1, 2):
+                move_times[strategies[player]] += times[player]
+
+        self.print_cross_table(engines, wins, move_times)
+        return wins
+
+    def print_cross_table(self, engines: list, wins: dict, move_times: dict) -> None:
+        """
+        Prints the win rate of each engine (row) against each other engine (column), its overall score and
+        its average time per move.
+        """
+        from rich.console import Console
+        from rich.table import Table
+
+        table = Table(title="Gauntlet", show_header=True, header_style="bold cyan")
+        table.add_column("Engine")
+        for engine in engines:
+            table.add_column(engine, justify="right")
+        table.add_column("Score", justify="right")
+        table.add_column("ms/move", justify="right")
+
+        for engine in engines:
+            row = [ "-" if opponent == engine else f"{100 * wins[engine][opponent] / self.N_GAMES:.0f}%"
+                    for opponent in engines ]
+            n_games = self.N_GAMES * (len(engines) - 1)
+            score = 100 * sum(wins[engine].values()) / n_games if n_games else 0
+            times = move_times[engine]
+            latency = 1000 * sum(times) / len(times) if times else 0
+            table.add_row(engine, *row, f"{score:.0f}%", f"{latency:.2f}")
+
+        Console().print(table)
+
+
+    def self_play(self, iterations: int = 200) -> list:
+        """
+        Runs N_GAMES games between MCTS players of "iterations" rounds per move, all at once in lockstep,
+        so that their playouts are evaluated in batches (see classes/selfplay.py). No window is ever opened.
+
+        @return   The winner of each game.
+        """
+        from classes.selfplay import SelfPlay
+
+        return SelfPlay(self.BOARD_SIZE, self.N_GAMES, iterations=iterations, record=self.record).run()
@@ -0,0 +1,93 @@
+from collections import namedtuple
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+# Kinds of bounds of a stored value
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Entry of the table, once unpacked
+Entry = namedtuple("Entry", ["value", "depth", "bound", "move"])
+
+# Number of entries per bucket: a depth-preferred one, and an always-replaced one
+BUCKET_SIZE = 2
+
+
+def pack(value: int, depth: int, bound: int, move: Optional[int]) -> int:
+    """
+    @return   The entry as a 64-bit integer: the value on 16 bits, the depth and the bound on 8 bits each,
+              and the move (a 1D node, -1 for none) on 16 bits.
+    """
+    return ((value + 0x8000) & 0xFFFF
+            | (depth & 0xFF) << 16
+            | (bound & 0xFF) << 24
+            | ((-1 if move is None else move) + 1 & 0xFFFF) << 32)
+
+
+def unpack(data: int) -> Entry:
+    move = (data >> 32 & 0xFFFF) - 1
+    return Entry((data & 0xFFFF) - 0x8000, data >> 16 & 0xFF, data >> 24 & 0xFF, None if move < 0 else move)
+
+
+class SharedTranspositionTable:
+    def __init__(self, n_buckets: int = 1 << 19, name: Optional[str] = None):
+        """
+        Fixed-size hash table of search results, stored in shared memory, so that worker processes can attach to it
+        by name (see attach) and share their results without any pickling.
+
+        Each entry is a pair of 64-bit words: the key xor the data, and the data (see pack).
+        Writes are not locked: an entry torn by concurrent writes does not satisfy the xor check anymore,
+        so that it is merely missed by probe.
+
+        A new table is created unless the name of an existing one is given.
+        """
+        self.n_buckets = n_buckets
+        size = n_buckets * BUCKET_SIZE * 2 * 8
+        self.memory = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.entries = np.ndarray((n_buckets, BUCKET_SIZE, 2), dtype=np.uint64, buffer=self.memory.buf)
+        if name is None:
+            self.entries[:] = 0
+
+    @classmethod
+    def attach(cls, name: str, n_buckets: int = 1 << 19) -> "SharedTranspositionTable":
+        return cls(n_buckets, name=name)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def probe(self, key: int) -> Optional[Entry]:
+        """
+        @return   The entry stored for the key, if any.
+        """
+        bucket = self.entries[key % self.n_buckets]
+        for check, data in bucket.tolist():
+            if data and check ^ data == key:
+                return unpack(data)
+        return None
+
+    def store(self, key: int, value: int, depth: int, bound: int, move: Optional[int] = None) -> None:
+        """
+        Stores an entry: in the first slot of the bucket if it is for the same key or at least as deep as the stored one,
+        and in the second slot otherwise.
+        """
+        bucket = self.entries[key % self.n_buckets]
+        data = pack(value, depth, bound, move)
+
+        check, stored = bucket[0].tolist()
+        slot = 0 if not stored or check ^ stored == key or depth >= unpack(stored).depth else 1
+        bucket[slot] = (key ^ data, data)
+
+    def clear(self) -> None:
+        self.entries[:] = 0
+
+    def close(self) -> None:
+        """
+        Detaches from the table; the process that created it should also unlink it once every process is done.
+        """
+        del self.entries
+        self.memory.close()
+
+    def unlink(self) -> None:
+        self.memory.unlink()
@@ -0,0 +1,126 @@
+import numpy as np
+
+# Flags of a node
+EXPANDED = 1
+TERMINAL = 2
+
+
+class TreeStore:
+    ROOT = 0
+
+    def __init__(self, capacity: int = 100000):
+        """
+        Search tree stored as a structure of arrays: a node is an index into preallocated NumPy arrays holding:
+           * the move leading to it, as a 1D node of the board (-1 for the root),
+           * its parent (-1 for the root),
+           * its first child, the children of a node being contiguous (-1 when not expanded),
+           * its number of children,
+           * its number of visits,
+           * its value, i.e., the total reward of the player who played its move,
+           * its flags, i.e., EXPANDED and TERMINAL.
+
+        At most "capacity" nodes are stored; see prune to make room when the store is full.
+        """
+        self.capacity = capacity
+        self.move = np.full(capacity, -1, dtype=np.int16)
+        self.parent = np.full(capacity, -1, dtype=np.int32)
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.n_children = np.zeros(capacity, dtype=np.int16)
+        self.visits = np.zeros(capacity, dtype=np.int32)
+        self.value = np.zeros(capacity, dtype=np.float32)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.size = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Empties the store (in bulk, i.e., without freeing any array) but for a new root.
+        """
+        used = slice(0, max(self.size, 1))
+        self.move[used] = -1
+        self.parent[used] = -1
+        self.first_child[used] = -1
+        self.n_children[used] = 0
+        self.visits[used] = 0
+        self.value[used] = 0
+        self.flags[used] = 0
+        self.size = 1
+
+    def is_full(self, n_moves: int) -> bool:
+        """
+        @return   True iff there is no room left for "n_moves" more children.
+        """
+        return self.size + n_moves > self.capacity
+
+    def children(self, node: int) -> range:
+        """
+        @return   The indices of the children of the node.
+        """
+        first = self.first_child[node]
+        return range(first, first + self.n_children[node])
+
+    def expand(self, node: int, moves: np.ndarray) -> None:
+        """
+        Adds one child per move to the node, i.e., a contiguous block of nodes.
+        """
+        assert not self.is_full(len(moves)), "tree store is full"
+        first, last = self.size, self.size + len(moves)
+        self.move[first:last] = moves
+        self.parent[first:last] = node
+        self.first_child[node] = first
+        self.n_children[node] = len(moves)
+        self.flags[node] |= EXPANDED
+        self.size = last
+
+    def backpropagate(self, node: int, reward: float) -> None:
+        """
+        Adds a visit from the node up to the root, where the reward (in [0, 1]) belongs to the player of the move
+        of the node, so that it alternates with the level.
+        """
+        while node != -1:
+            self.visits[node] += 1
+            self.value[node] += reward
+            reward = 1 - reward
+            node = self.parent[node]
+
+    def prune(self) -> None:
+        """
+        Makes room by removing the children of the least-visited nodes, i.e., those visited at most as many times
+        as the median expanded node, but the root. The removed subtrees have to be searched again, although their
+        nodes keep their statistics.
+
+        Remaining nodes are then compacted in breadth-first order, so that children stay contiguous.
+        """
+        expanded = np.flatnonzero(self.n_children[:self.size])
+        threshold = np.median(self.visits[expanded]) if len(expanded) else 0
+
+        order = [ self.ROOT ]
+        kept = np.zeros(self.size, dtype=bool)
+        for node in order:
+            if self.n_children[node] and (node == self.ROOT or self.visits[node] > threshold):
+                kept[node] = True
+                order.extend(self.children(node))
+
+        order = np.array(order)
+        new_index = np.full(self.size, -1, dtype=np.int32)
+        new_index[order] = np.arange(len(order), dtype=np.int32)
+
+        size = len(order)
+        kept = kept[order]
+        self.move[:size] = self.move[order]
+        self.visits[:size] = self.visits[order]
+        self.value[:size] = self.value[order]
+        self.flags[:size] = self.flags[order]
+        self.n_children[:size] = np.where(kept, self.n_children[order], 0)
+        self.first_child[:size] = np.where(kept, new_index[self.first_child[order]], -1)
+        self.parent[:size] = np.where(order == self.ROOT, -1, new_index[self.parent[order]])
+        self.flags[:size] &= np.where(kept, 0xFF, ~EXPANDED & 0xFF).astype(np.uint8)
+
+        self.move[size:self.size] = -1
+        self.parent[size:self.size] = -1
+        self.first_child[size:self.size] = -1
+        self.n_children[size:self.size] = 0
+        self.visits[size:self.size] = 0
+        self.value[size:self.size] = 0
+        self.flags[size:self.size] = 0
+        self.size = size
@@ -1,19 +1,15 @@
-from typing import List
-
-def index_finder(_list: List, value : int) -> List:
-    return [ind for ind, val in enumerate(_list) if val == value]
-
-
-def all_equal(_list: List) -> bool:
-    _list = iter(_list)
-    try:
-        first = next(_list)
-    except StopIteration:
-        return True
-    return all(first == x for x in _list)
-
-
 def milliseconds_to_minutes_seconds(milliseconds: float) -> tuple:
     minutes = (milliseconds // (1000 * 60)) % 60
     seconds = (milliseconds // 1000) % 60
-    return (minutes, seconds)
\ No newline at end of file
+    return (minutes, seconds)
+
+# Offsets of the six neighbours of a node, as in Logic.get_neighbours
+HEX_DIRECTIONS = [(-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0)]
+
+# Offsets of the six two-bridges of a node, each with the two carrier offsets shared by both ends
+BRIDGE_DIRECTIONS = [((-1, -1), (-1, 0), (0, -1)),
+                     ((-2, 1),  (-1, 0), (-1, 1)),
+                     ((-1, 2),  (-1, 1), (0, 1)),
+                     ((1, 1),   (0, 1),  (1, 0)),
+                     ((2, -1),  (1, -1), (1, 0)),
+                     ((1, -2),  (0, -1), (1, -1))]
@@ -1,15 +1,20 @@
+import argparse
 import logging
+import os
 
 from rich import print
-from rich.logging import RichHandler
-
-FORMAT = "%(message)s"
-logging.basicConfig(level="NOTSET", format=FORMAT, datefmt="[%X]", handlers=[RichHandler()])
 
+from classes.registry import ENGINES, engine_spec, resolve
+from classes.strategy import STRAT
 from classes.tournament import Tournament
 
+# Modes in which only AI players play
+AI_MODES = ("ai_vs_ai", "sprt", "gauntlet", "selfplay", "sweep")
+
 
-def main(args):
+def main(args, strategies=None, headless=False, record=None, patterns=None, prior_width=None, sprt=None, engines=None,
+         iterations=200, workers=1, table_size=0, seed=None, checkpoint=None, checkpoint_every=10,
+         metrics=None, replay=None, cache=None, sweep=None, use_kernels=True):
     """
     Runs a tournament with a list of arguments that contain, in order:
        * the size of the board,
@@ -19,28 +24,207 @@ def main(args):
 
     In the "ai_vs_ai" mode, there is a real competition.
     In contrast, in the "man_vs_ai" mode, there is a single match, i.e., the last parameter is ineffective.
+    In the "sprt" mode, games between AI players stop as soon as the statistical test given by the "sprt"
+    dictionary (elo0, elo1, alpha, beta) concludes, i.e., the last parameter is a maximum.
+    In the "gauntlet" mode, every pair of the given engines plays the given number of games.
+    In the "selfplay" mode, the given number of games between MCTS players (of "iterations" rounds per move)
+    are played all at once.
+    In the "sweep" mode, every pair of the given engines plays the given number of games on each board size and at
+    each depth of the "sweep" dictionary (board_sizes, depths, output), the board size of the arguments being ignored.
+    The searches use the compiled kernels of classes/kernels.py when Numba is installed, unless "use_kernels" is False.
+    In the "replay" mode, a recorded game is shown again, as given by the "replay" dictionary (record, game, speed).
+    In the AI modes, the alpha-beta searches reuse the results of previous runs kept in the "cache" file, if any.
     """
-    arena = Tournament(args)
+    mode = args[1]
+    if mode == "replay":
+        from classes.records import load_records
+        from classes.replay import Replay
+
+        records = list(load_records(replay["record"]))
+        Replay(records[replay["game"]], speed=replay["speed"]).run()
+        return
+
+    if mode == "sweep":
+        from classes.sweep import Sweep
+
+        Sweep(sweep["board_sizes"], sweep["depths"], engines or list(strategies.values()), args[3],
+              workers=workers, seed=seed, use_kernels=use_kernels).run(sweep["output"])
+        return
+
+    if mode in AI_MODES:
+        args = [ args[0], "ai_vs_ai" ] + args[2:]
+    arena = Tournament(args, strategies=strategies, headless=headless,
+                       record=record, patterns=patterns, prior_width=prior_width,
+                       workers=workers, table_size=table_size, seed=seed, metrics=metrics, cache=cache,
+                       use_kernels=use_kernels)
 
-    if   MODE == "ai_vs_ai":    arena.championship()
-    elif MODE == "man_vs_ai":   arena.single_game(black_starts=True)
+    if   mode == "ai_vs_ai":    arena.championship(checkpoint, checkpoint_every)
+    elif mode == "sprt":        arena.match(**(sprt or {}))
+    elif mode == "gauntlet":    arena.gauntlet(engines or list(ENGINES))
+    elif mode == "selfplay":    arena.self_play(iterations)
+    elif mode == "man_vs_ai":   arena.single_game(black_starts=True)
     else: assert False, "SHOULD NOT HAPPEN UNLESS YOU IMPLEMENT THE man_vs_man VERSION"
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hex game between AI strategies (or against a human).")
+    parser.add_argument("--board-size", type=int, default=5, help="size of the board (2 to 26)")
+    parser.add_argument("--mode", choices=list(AI_MODES) + ["man_vs_ai", "replay"], default="ai_vs_ai",
+                        help="let the AI play alone, test whether BLACK's strategy beats WHITE's, "
+                             "compare many engines, generate MCTS self-play games, "
+                             "measure engines over a grid of board sizes and depths, "
+                             "play as the BLACK player against the AI, or replay a recorded game")
+    parser.add_argument("--games", type=int, default=100,
+                        help="number of games to play in ai_vs_ai mode (maximum in sprt mode, per pair in gauntlet mode, "
+                             "per pair, board size and depth in sweep mode)")
+    parser.add_argument("--black", type=engine_spec, default=STRAT.DEFAULT_STRATEGIES[1],
+                        help="engine of the BLACK player, e.g., minimaxAB:depth=2 (ignored in man_vs_ai mode)")
+    parser.add_argument("--white", type=engine_spec, default=STRAT.DEFAULT_STRATEGIES[2],
+                        help="engine of the WHITE player")
+    parser.add_argument("--engines", type=engine_spec, nargs="+", metavar="ENGINE",
+                        help=f"engines of the gauntlet mode (default: {' '.join(ENGINES)}) "
+                             "and of the sweep mode (default: --black and --white)")
+    parser.add_argument("--headless", action="store_true",
+                        help="do not open any window (AI modes only)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="append the finished games to this JSON-lines file (in replay mode, read the game from it)")
+    parser.add_argument("--replay-game", type=int, default=0, help="index of the recorded game to replay")
+    parser.add_argument("--speed", type=float, default=2, help="plies per second in replay mode")
+    parser.add_argument("--patterns", metavar="PATH",
+                        help="weight table (see classes/patterns.py) ranking the moves explored by the AI players")
+    parser.add_argument("--prior-width", type=int, default=None,
+                        help="number of best-ranked moves kept at each node when --patterns is given")
+    parser.add_argument("--elo0", type=float, default=0, help="Elo difference under H0 in sprt mode")
+    parser.add_argument("--elo1", type=float, default=10, help="Elo difference under H1 in sprt mode")
+    parser.add_argument("--alpha", type=float, default=0.05, help="false positive rate in sprt mode")
+    parser.add_argument("--beta", type=float, default=0.05, help="false negative rate in sprt mode")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[ 3, 4, 5 ], choices=range(2, 27), metavar="SIZE",
+                        help="board sizes of the sweep mode (2 to 26)")
+    parser.add_argument("--depths", type=int, nargs="+", default=[ 1, 2, 3 ], metavar="DEPTH",
+                        help="search depths of the sweep mode")
+    parser.add_argument("--output", metavar="PATH", help="CSV file where the results of the sweep mode are written")
+    parser.add_argument("--iterations", type=int, default=200, help="MCTS rounds per move in selfplay mode")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of processes playing games in parallel (AI modes but selfplay)")
+    parser.add_argument("--table-size", type=int, default=0,
+                        help="buckets of the transposition table shared by the alpha-beta searches (0 for none)")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="file of search results reused by the alpha-beta searches, and updated at the end of the run")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the games, for reproducible runs")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="file where ai_vs_ai results are saved, and from which an interrupted run resumes")
+    parser.add_argument("--checkpoint-every", type=int, default=10, help="games between two checkpoints")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve live metrics in the Prometheus format on http://localhost:PORT/metrics")
+    parser.add_argument("--metrics-file", metavar="PATH", default=None,
+                        help="rewrite live metrics in the Prometheus format to this file periodically")
+    parser.add_argument("--metrics-interval", type=float, default=5, help="seconds between two rewrites of --metrics-file")
+    parser.add_argument("--no-kernels", action="store_true",
+                        help="search with the pure Python code even when Numba is installed (see classes/kernels.py)")
+    parser.add_argument("--log-level", default="WARNING",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
+    options = parser.parse_args(argv)
+
+    if options.mode == "sweep" and options.engines is not None and len(options.engines) < 2:
+        parser.error("the sweep mode needs at least two engines (or none, for --black and --white)")
+
+    if options.checkpoint_every < 1:
+        parser.error("--checkpoint-every must be at least 1")
+
+    if not options.elo0 < options.elo1:
+        parser.error(f"--elo0 ({options.elo0}) must be lower than --elo1 ({options.elo1})")
+    for name in ("alpha", "beta"):
+        if not 0 < getattr(options, name) < 1:
+            parser.error(f"--{name} must be strictly between 0 and 1")
+
+    from classes.mcts import min_capacity
+
+    board_sizes = options.sizes if options.mode == "sweep" else [ options.board_size ]
+    for spec in options.engines or [ options.black, options.white ]:
+        capacity = resolve(spec)[1].get("capacity")
+        if capacity is not None and capacity < min_capacity(max(board_sizes)):
+            parser.error(f"capacity {capacity} of {spec} is too small for a {max(board_sizes)}x{max(board_sizes)} board, "
+                         f"which needs at least {min_capacity(max(board_sizes))} nodes")
+
+    if options.cache is not None and os.path.exists(options.cache):
+        from classes.cache import PositionCache
+
+        try:
+            PositionCache(options.cache)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if options.mode == "ai_vs_ai" and options.checkpoint is not None:
+        from classes.checkpoint import check_checkpoint, load_checkpoint
+
+        state = load_checkpoint(options.checkpoint)
+        if state is not None:
+            try:
+                check_checkpoint(options.checkpoint, state, [ options.board_size, options.mode, 0, options.games ],
+                                 { "1": options.black, "2": options.white })
+            except ValueError as error:
+                parser.error(str(error))
+
+    if options.mode == "replay":
+        if options.record is None:
+            parser.error("the replay mode needs the --record file of the game to replay")
+        if not os.path.isfile(options.record):
+            parser.error(f"no such record file: {options.record}")
+
+        from classes.records import load_records
+
+        n_games = sum(1 for _ in load_records(options.record))
+        if not 0 <= options.replay_game < n_games:
+            parser.error(f"--replay-game must be from 0 to {n_games - 1}, as {options.record} holds {n_games} games"
+                         if n_games else f"{options.record} holds no game")
+    return options
+
+
 if __name__ == "__main__":
+    options = parse_args()
+
+    from rich.logging import RichHandler
+
+    FORMAT = "%(message)s"
+    logging.basicConfig(level=options.log_level, format=FORMAT, datefmt="[%X]", handlers=[RichHandler()])
     log = logging.getLogger("rich")
 
-    print("Do you want to play against AI (type 1) or let the AI play alone (type 2)?", end="\t")
-    gamemode = int(input())
-    if gamemode == 1:
-        MODE = "man_vs_ai"
+    if options.mode == "man_vs_ai":
         print("You will be playing as the [bold]BLACK player[/bold]!")
-    else:
-        MODE = "ai_vs_ai"
-        print("Ok, let the AI play alone.")    
 
-    BOARD_SIZE = 5
+    BOARD_SIZE = options.board_size
+    MODE       = options.mode
     GAME_COUNT = 0
-    N_GAMES    = 100
+    N_GAMES    = options.games
+
+    metrics, exporter = None, None
+    if options.metrics_port is not None or options.metrics_file is not None:
+        from classes.metrics import Metrics, MetricsExporter
+        metrics = Metrics()
+        exporter = MetricsExporter(metrics, port=options.metrics_port, path=options.metrics_file,
+                                   interval=options.metrics_interval)
+        exporter.start()
 
-    main([ BOARD_SIZE, MODE, GAME_COUNT, N_GAMES ])
+    try:
+        main([ BOARD_SIZE, MODE, GAME_COUNT, N_GAMES ],
+             strategies={ 1: options.black, 2: options.white },
+             headless=options.headless,
+             record=options.record,
+             patterns=options.patterns,
+             prior_width=options.prior_width,
+             sprt={ "elo0": options.elo0, "elo1": options.elo1, "alpha": options.alpha, "beta": options.beta },
+             engines=options.engines,
+             iterations=options.iterations,
+             workers=options.workers,
+             table_size=options.table_size,
+             seed=options.seed,
+             checkpoint=options.checkpoint,
+             checkpoint_every=options.checkpoint_every,
+             metrics=metrics,
+             replay={ "record": options.record, "game": options.replay_game, "speed": options.speed },
+             cache=options.cache,
+             sweep={ "board_sizes": options.sizes, "depths": options.depths, "output": options.output },
+             use_kernels=not options.no_kernels)
+    finally:
+        if exporter is not None:
+            exporter.stop()